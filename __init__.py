@@ -18,34 +18,49 @@ bl_info = {
 import bpy
 from bpy.props import StringProperty
 from bpy.types import AddonPreferences
+import gc
 import importlib
+import logging
 import os
+import sys
 
-# Import addon modules with direct imports - Blender's extension build uses a flat structure
-from . import operators
-from . import panels
+log = logging.getLogger(__name__)
 
-# Modules that need reloading on addon restart
+# Addon submodules - imported lazily in register() so Blender only pays for
+# loading the SDK/HTTP stack and panel classes when the addon is enabled
 modules = (
-    operators,
-    panels,
+    "operators",
+    "panels",
 )
 
-def reload_modules():
-    """Reload addon modules when the addon is restarted"""
-    for module in modules:
-        importlib.reload(module)
+def __getattr__(name):
+    """Load addon submodules on first attribute access (PEP 562)"""
+    if name in modules:
+        module = importlib.import_module(f".{name}", __package__)
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def _api_key_updated(self, context):
+    """Drop the API key cached by the operators module when it is edited"""
+    operators = sys.modules.get(f"{__package__}.operators")
+    if operators is not None:
+        operators.invalidate_api_key()
+
+# API key property definition, built once at module scope
+_API_KEY_PROP = StringProperty(
+    name="API Key",
+    description="Enter your Masterpiece X API key",
+    default="",
+    subtype='PASSWORD',
+    update=_api_key_updated,
+)
 
 class MasterpieceXPreferences(AddonPreferences):
     """Addon preferences for storing API key"""
-    bl_idname = "bl_ext.user_default.masterpiece_x_generator"  # Full module path for Blender 4.3 extensions
+    bl_idname = __package__  # Full module path, e.g. bl_ext.user_default.masterpiece_x_generator
 
-    api_key: StringProperty(
-        name="API Key",
-        description="Enter your Masterpiece X API key",
-        default="",
-        subtype='PASSWORD'
-    )
+    __annotations__ = {"api_key": _API_KEY_PROP}
 
     def draw(self, context):
         """Draw the preferences panel"""
@@ -58,113 +73,113 @@ class MasterpieceXPreferences(AddonPreferences):
 classes = (
     MasterpieceXPreferences,
 )
+_classes_reversed = classes[::-1]
+
+# Classes this addon has registered with Blender. Kept across module reloads
+# so a copy registered by a previous load can still be unregistered.
+_registered = globals().get("_registered", set())
 
 def register():
     """Register the addon and its classes"""
-    # Reload modules when addon is reloaded
-    try:
-        reload_modules()
-    except Exception as e:
-        print(f"Failed to reload modules: {e}")
+    global operators, panels
+
+    # unregister() drops the submodules from sys.modules, so the imports
+    # below always load them fresh. Make sure the finders rescan the addon
+    # directory so edited files are picked up.
+    importlib.invalidate_caches()
         
+    # Drop stale copies registered by a previous load of this module
+    for cls in _registered - set(classes):
+        bpy.utils.unregister_class(cls)
+        _registered.discard(cls)
+
     # Register preferences class
     for cls in classes:
-        try:
-            # First try to unregister if it's already registered to prevent double registration
-            if hasattr(bpy.types, cls.__name__):
-                try:
-                    bpy.utils.unregister_class(cls)
-                    print(f"Unregistered existing {cls.__name__} before re-registration")
-                except:
-                    pass
-                
-            # Now register the class
-            bpy.utils.register_class(cls)
-            print(f"Successfully registered {cls.__name__}")
-        except Exception as e:
-            print(f"Could not register {cls.__name__}: {e}")
+        if cls in _registered:
+            continue
+        bpy.utils.register_class(cls)
+        _registered.add(cls)
     
+    # Import submodules now that the addon is actually being enabled
+    operators = importlib.import_module(".operators", __package__)
+    panels = importlib.import_module(".panels", __package__)
+
     # Register operators and panels
     try:
         operators.register()
-    except Exception as e:
-        print(f"Error registering operators: {e}")
+    except Exception:
+        log.exception("Error registering operators")
         
     try:
         panels.register()
-    except Exception as e:
-        print(f"Error registering panels: {e}")
+    except Exception:
+        log.exception("Error registering panels")
 
 def unregister():
     """Unregister the addon and its classes"""
+    # Look up the submodules loaded by register() instead of importing them again
+    operators = sys.modules.get(f"{__package__}.operators")
+    panels = sys.modules.get(f"{__package__}.panels")
+
     # First perform critical cleanup before any unregistration
-    try:
-        print("Cleaning up resources...")
-        from . import operators
-        operators.cleanup_resources()
-        
-        # Import necessary modules for cleanup
-        import sys
-        import gc
-    except Exception as e:
-        print(f"Error importing modules for cleanup: {e}")
+    # (if operators was never loaded there is nothing to clean up)
+    if operators is not None:
+        try:
+            log.debug("Cleaning up resources...")
+            operators.cleanup_resources()
+        except Exception:
+            log.exception("Error cleaning up resources")
     
     # Clear any environment variables set by the addon
-    try:
-        if "MPX_SDK_BEARER_TOKEN" in os.environ:
-            del os.environ["MPX_SDK_BEARER_TOKEN"]
-    except Exception as e:
-        print(f"Error clearing environment variables: {e}")
+    os.environ.pop("MPX_SDK_BEARER_TOKEN", None)
             
     # Clear any Blender data created by the addon
     try:
-        # Clear any preview images
-        if "MPX_Preview_Image" in bpy.data.images:
-            bpy.data.images.remove(bpy.data.images["MPX_Preview_Image"])
-    except Exception as e:
-        print(f"Error clearing Blender data: {e}")
+        # Clear the preview image using the panel's cached reference
+        if panels is not None:
+            panels.remove_preview_image()
+    except Exception:
+        log.exception("Error clearing Blender data")
         
     # Unregister operators and panels with proper exception handling
-    try:
-        operators.unregister()
-    except Exception as e:
-        print(f"Error unregistering operators: {e}")
+    if operators is not None:
+        try:
+            operators.unregister()
+        except Exception:
+            log.exception("Error unregistering operators")
         
-    try:
-        panels.unregister()
-    except Exception as e:
-        print(f"Error unregistering panels: {e}")
+    if panels is not None:
+        try:
+            panels.unregister()
+        except Exception:
+            log.exception("Error unregistering panels")
     
     # Unregister preference class
-    for cls in reversed(classes):
+    for cls in _classes_reversed:
         try:
-            if hasattr(bpy.types, cls.__name__):
+            if cls in _registered:
                 bpy.utils.unregister_class(cls)
-        except Exception as e:
-            print(f"Could not unregister {cls.__name__}: {e}")
+                _registered.discard(cls)
+        except Exception:
+            log.exception("Could not unregister %s", cls.__name__)
     
     # Reference cleanup for better unloading
     try:
-        # Force multiple garbage collection passes
-        print("Running garbage collection to release module references...")
-        for _ in range(3):
-            gc.collect()
-        
-        # Clear module references
-        modules_to_clear = ["operators", "panels"]
-        for module_name in modules_to_clear:
-            if module_name in globals():
-                globals()[module_name] = None
+        # Drop the submodules from sys.modules as well as the package namespace
+        # so they are really released and the next enable imports them fresh
+        for name in modules:
+            sys.modules.pop(f"{__package__}.{name}", None)
+            globals().pop(name, None)
         
-        # Run garbage collection again after clearing references
-        gc.collect()
-    except Exception as e:
-        print(f"Error in reference cleanup: {e}")
+        # A single full collection picks up any remaining reference cycles
+        gc.collect(2)
+    except Exception:
+        log.exception("Error in reference cleanup")
         
-    print("Masterpiece X Generator unregistered successfully")
+    log.debug("Masterpiece X Generator unregistered successfully")
     
-    # For debugging - print warning about waiting for shutdown
-    print("Note: Some files may only be fully released when Blender is closed")
+    # For debugging - note about waiting for shutdown
+    log.debug("Note: Some files may only be fully released when Blender is closed")
 
 if __name__ == "__main__":
     register() 
\ No newline at end of file
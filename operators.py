@@ -7,143 +7,424 @@ and the downloading and importing of the generated models.
 
 The generation process is split into multiple operators to make it non-blocking:
 1. MPXGEN_OT_GenerateModel - Starts the generation process
-2. MPXGEN_OT_PollStatus - Handles polling the API for status updates
-3. MPXGEN_OT_ProcessImage - Processes the generated image
-4. MPXGEN_OT_DownloadModel - Downloads and imports the model
+2. MPXGEN_OT_PollStatus - Drives the generation steps and polls the API for status updates
+
+Once the model is ready, start_model_download() fetches it on the worker
+pool and a bpy.app.timers callback imports it on the main thread.
+
+Network requests run on worker threads, the operators only check their
+results from the main thread.
 
 The InstallDependencies and CancelGeneration operators handle utility functions.
 """
 
 import bpy
+import importlib
+import importlib.util
 import os
 import sys
 import tempfile
+import shutil
 import json
+import hashlib
 import time
 import subprocess
+import functools
+from bpy.app.handlers import persistent
 from bpy.props import StringProperty, BoolProperty, EnumProperty, IntProperty, FloatProperty
 from pathlib import Path
-from io import BytesIO
 import threading
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, fields
 import re
+import random
+import logging
+
+# The required modules should be available from wheels. Importing them pulls
+# in the whole HTTP stack, so only check they can be found here and import
+# them with ensure_sdk() once a generation needs them.
+MASTERPIECEX_INSTALLED = (importlib.util.find_spec("mpx_genai_sdk") is not None
+                          and importlib.util.find_spec("requests") is not None)
+Masterpiecex = APIConnectionError = InternalServerError = requests = None
+
+log = logging.getLogger(__name__)
 
-# Try to import the required modules - these should be available from wheels
-try:
-    from mpx_genai_sdk import Masterpiecex
-    import requests
+def ensure_sdk():
+    """Import the SDK and requests into the module globals, raises ImportError if they're missing"""
+    global MASTERPIECEX_INSTALLED, Masterpiecex, APIConnectionError, InternalServerError, requests
+    if Masterpiecex is not None:
+        return
+    try:
+        from mpx_genai_sdk import Masterpiecex, APIConnectionError, InternalServerError
+        import requests
+    except ImportError:
+        # find_spec() also finds a package that can't be imported here (e.g.
+        # a wheel built for another platform), bring the install UI back
+        MASTERPIECEX_INSTALLED = False
+        force_ui_update()
+        raise
     MASTERPIECEX_INSTALLED = True
-except ImportError:
-    MASTERPIECEX_INSTALLED = False
-
-# Global state dictionary to track generation progress
-generation_status = {
-    "active": False,           # Whether generation is active
-    "status_text": "",         # Current status message
-    "progress": 0,             # Progress percentage (0-100)
-    "current_step": "",        # Current step in the process
-    "error": "",               # Error message if any
-    "client": None,            # Masterpiece X client instance
-    "image_request_id": None,  # ID of the text-to-image request
-    "image_url": None,         # URL of the generated image
-    "image_path": None,        # Local path to saved image
-    "model_request_id": None,  # ID of the image-to-3D request
-    "model_url": None,         # URL of the generated model
-    "model_path": None,        # Local path to saved model
-    "asset_request_id": None,  # ID of the asset upload
-    "last_poll_time": 0,       # Last time we checked status
-    "start_time": 0,           # When generation started
-    "active_threads": []       # Track active background threads
-}
+
+# Shared HTTP session so downloads and uploads reuse keep-alive connections
+_SESSION = None
+
+# Guards the lazy creation of the session and the worker pool, both are
+# first used from the poller and worker threads as well as the main thread
+_INIT_LOCK = threading.Lock()
+
+def get_http_session():
+    """Return the shared requests session, creating it on first use"""
+    global _SESSION
+    if _SESSION is not None:
+        return _SESSION
+    with _INIT_LOCK:
+        if _SESSION is not None:
+            return _SESSION
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        session = requests.Session()
+        # Retry downloads on connection errors, rate limiting and gateway errors.
+        # Uploads are retried by retry_upload(), a streamed file body can't be
+        # rewound by urllib3.
+        retries = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=(429, 502, 503, 504),
+            allowed_methods=frozenset(("GET", "HEAD")),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retries)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        _SESSION = session
+    return _SESSION
+
+# Upload responses that are worth trying again, and how many tries an upload gets
+_RETRY_STATUSES = frozenset((408, 429, 500, 502, 503, 504))
+_UPLOAD_TRIES = 5
+
+def _retry_after(response):
+    """Delay in seconds asked for by a Retry-After header, or None"""
+    try:
+        return float(response.headers["Retry-After"])
+    except (KeyError, ValueError):
+        # Missing, or an HTTP date which isn't worth parsing here
+        return None
+
+def retry_upload(upload):
+    """
+    Call upload() until its response isn't a transient error, returns the last response.
+    
+    upload() makes one complete attempt and returns the response, it is
+    called again for every retry as a streamed body can only be sent once.
+    Connection errors and 408/429/5xx responses are retried with
+    exponential backoff and jitter, or after the server's Retry-After.
+    """
+    for attempt in range(_UPLOAD_TRIES):
+        last_try = attempt == _UPLOAD_TRIES - 1
+        delay = min(30, 0.5 * 2 ** attempt) + random.uniform(0, 0.5)
+        try:
+            response = upload()
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            if last_try:
+                raise
+            log.warning("Upload failed, retrying in %.1fs", delay, exc_info=True)
+        else:
+            if response.status_code not in _RETRY_STATUSES or last_try:
+                return response
+            delay = min(30, _retry_after(response) or delay)
+            log.warning("Upload returned HTTP %d, retrying in %.1fs", response.status_code, delay)
+        time.sleep(delay)
+
+# Flags for writing downloads through a raw file descriptor, O_BINARY only exists
+# on Windows and O_CLOEXEC keeps the fd out of any subprocess
+_WRITE_FLAGS = (os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+                | getattr(os, "O_CLOEXEC", 0) | getattr(os, "O_BINARY", 0))
+
+def _write_chunks(path, chunks):
+    """Write an iterable of byte chunks to path without Python's buffered IO layer"""
+    fd = os.open(path, _WRITE_FLAGS, 0o600)
+    try:
+        for chunk in chunks:
+            view = memoryview(chunk)
+            while view:
+                view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+def download_to_file(url, path, timeout):
+    """Stream a download to disk in 1 MiB chunks, replacing path only when complete"""
+    # A unique name, so concurrent downloads of the same file (e.g. into the
+    # model cache from two Blender instances) don't write into each other
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(path), prefix=os.path.basename(path) + ".", suffix=".tmp"
+    )
+    os.close(fd)
+    try:
+        with get_http_session().get(url, timeout=timeout, stream=True) as response:
+            response.raise_for_status()
+            # iter_content() gunzips a Content-Encoding'd body chunk by chunk and
+            # passes an unencoded one straight through, never buffering it whole
+            _write_chunks(tmp_path, response.iter_content(chunk_size=1 << 20))
+        os.replace(tmp_path, path)
+    except BaseException:
+        # Don't leave a partial download behind, e.g. in the model cache
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def response_excerpt(response, limit=256):
+    """Status code and the start of a response body, for error messages"""
+    # Error pages can be long HTML documents, don't decode more than is shown
+    body = response.content[:limit].decode('utf-8', 'replace')
+    return f"HTTP {response.status_code}: {body}"
+
+def close_http_session():
+    """Close the shared requests session and release its connections"""
+    global _SESSION
+    if _SESSION is not None:
+        try:
+            _SESSION.close()
+        except Exception:
+            pass
+        _SESSION = None
+
+# Masterpiece X client and the API key it was created for, reused across
+# generations so its connection pool is kept
+_client = None
+_client_api_key = None
+
+def get_client(api_key):
+    """Return a Masterpiece X client for api_key, creating one only when the key changes"""
+    global _client, _client_api_key
+    if _client is None or _client_api_key != api_key:
+        close_client()
+        os.environ["MPX_SDK_BEARER_TOKEN"] = api_key
+        # _safe_retrieve() does its own retrying, the SDK's retries would
+        # multiply it and stack their backoff on top of the poll delays
+        _client = Masterpiecex(max_retries=0)
+        _client_api_key = api_key
+    return _client
+
+def close_client():
+    """Close the cached Masterpiece X client and release its connections"""
+    global _client, _client_api_key
+    if _client is not None:
+        try:
+            _client.close()
+        except Exception:
+            pass
+        _client = None
+        _client_api_key = None
+
+# Shared worker pool for downloads and uploads, so the worker threads are
+# reused across the image and model phases instead of recreated each time
+_EXECUTOR = None
+
+def get_executor():
+    """Return the shared worker pool, creating it on first use"""
+    global _EXECUTOR
+    if _EXECUTOR is not None:
+        return _EXECUTOR
+    with _INIT_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="mpx-io")
+    return _EXECUTOR
+
+def shutdown_executor():
+    """Drop queued work and release the worker pool without waiting for running jobs"""
+    global _EXECUTOR
+    if _EXECUTOR is not None:
+        _EXECUTOR.shutdown(wait=False, cancel_futures=True)
+        _EXECUTOR = None
+
+# Addon id the preferences are registered under, the package's full module
+# path so it also matches when installed from another extension repository
+ADDON_ID = __package__
+
+# API key read from the addon preferences, refreshed when the preference is edited
+_cached_api_key = None
+
+def get_api_key(context):
+    """Return the API key from the addon preferences, reading them only once"""
+    global _cached_api_key
+    if _cached_api_key is None:
+        addon = context.preferences.addons.get(ADDON_ID)
+        if addon is None or addon.preferences is None:
+            return ""
+        _cached_api_key = addon.preferences.api_key
+    return _cached_api_key
+
+def invalidate_api_key():
+    """Forget the cached API key so the next get_api_key() reads the preferences"""
+    global _cached_api_key
+    _cached_api_key = None
+
+@dataclass(slots=True)
+class GenState:
+    """Global state tracking generation progress"""
+    active: bool = False              # Whether generation is active
+    status_text: str = ""             # Current status message
+    status_base: str = ""             # Status message without the elapsed time suffix
+    progress: int = 0                 # Progress percentage (0-100)
+    current_step: str = ""            # Current step in the process
+    error: str = ""                   # Error message if any
+    client: object = None             # Masterpiece X client instance
+    image_request_id: str = None      # ID of the text-to-image request
+    image_url: str = None             # URL of the generated image
+    model_request_id: str = None      # ID of the image-to-3D request
+    model_url: str = None             # URL of the generated model
+    model_path: str = None            # Local path to saved model
+    tmp_dir: str = None               # Temporary directory for this generation's files
+    image_asset: object = None        # Future of the asset the generated image is uploaded to
+    model_download: object = None     # Future of the model download
+    cache_key: str = None             # Model cache key of a text-to-3D generation
+    seed: int = 0                     # Seed of the image-to-3D request
+    texture_size: int = 0             # Texture size of the image-to-3D request
+    startup: object = None            # Future of the background request that starts a workflow
+    api_key: str = None               # API key captured when generation started
+    start_time: float = 0             # When generation started (time.monotonic)
+    
+    def reset(self):
+        """Restore every field to its default"""
+        for field in fields(self):
+            setattr(self, field.name, field.default)
+
+generation_status = GenState()
+
+# Matches the top-level packages shipped as wheels (and their submodules),
+# which are unloaded on cleanup to release their DLL files
+_DEPENDENCY_MODULE_RE = re.compile(
+    r"^(?:charset_normalizer|pydantic|pydantic_core|mpx_genai_sdk|requests|urllib3|httpx|idna|certifi"
+    r"|anyio|httpcore|sniffio|distro|h11|typing_extensions|annotated_types)(?:\.|$)"
+)
+
+def get_output(status_response, name):
+    """Return status_response.outputs.<name>, or None if the response doesn't have it"""
+    return getattr(getattr(status_response, 'outputs', None), name, None)
+
+# Generation steps that wait on the API and show the elapsed time in the status
+_ELAPSED_TIME_STEPS = frozenset(("image", "model"))
+
+# Number of generated models kept in the model cache
+_MODEL_CACHE_SIZE = 50
+
+_model_cache_dir = None
+
+def model_cache_dir():
+    """Directory of the model cache, created on first use"""
+    global _model_cache_dir
+    if _model_cache_dir is None:
+        try:
+            _model_cache_dir = bpy.utils.extension_path_user(__package__, path="model_cache", create=True)
+        except (AttributeError, ValueError):
+            # Not installed as an extension (or Blender older than 4.2)
+            _model_cache_dir = os.path.join(os.path.expanduser("~"), ".mpxgen_cache")
+            os.makedirs(_model_cache_dir, exist_ok=True)
+    return _model_cache_dir
+
+def model_cache_key(**params):
+    """Cache key for the generation parameters that fully determine a model"""
+    return hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()
+
+def model_cache_path(key):
+    """Path of the cached model for key, whether or not it exists yet"""
+    return os.path.join(model_cache_dir(), f"{key}.glb")
+
+def evict_model_cache():
+    """Delete the least recently used models beyond _MODEL_CACHE_SIZE"""
+    try:
+        with os.scandir(model_cache_dir()) as entries:
+            models = [e for e in entries if e.name.endswith(".glb") and e.is_file()]
+    except OSError:
+        return
+    models.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+    for entry in models[_MODEL_CACHE_SIZE:]:
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass
+
+# Prefix of the generation temp directories, specific to this addon since
+# remove_stale_temp_dirs() deletes whatever matches it in the temp directory
+_TEMP_PREFIX = "mpxgen_"
+
+def job_temp_path(filename):
+    """
+    Return a path for a temporary file in the current generation's temp directory.
+    
+    Creates the directory and records it in generation_status, so call it
+    from the main thread only.
+    """
+    tmp_dir = generation_status.tmp_dir
+    if not tmp_dir or not os.path.isdir(tmp_dir):
+        tmp_dir = tempfile.mkdtemp(prefix=_TEMP_PREFIX)
+        generation_status.tmp_dir = tmp_dir
+    return os.path.join(tmp_dir, filename)
+
+# Temp directories left this long by a crashed session are removed on register
+_STALE_TEMP_AGE = 24 * 60 * 60
+
+def remove_stale_temp_dirs():
+    """Delete the temp directories of generations from earlier sessions"""
+    cutoff = time.time() - _STALE_TEMP_AGE
+    try:
+        with os.scandir(tempfile.gettempdir()) as entries:
+            stale = [
+                entry.path for entry in entries
+                if entry.name.startswith(_TEMP_PREFIX) and entry.is_dir(follow_symlinks=False)
+                and entry.stat().st_mtime < cutoff
+            ]
+    except OSError:
+        return
+    for path in stale:
+        shutil.rmtree(path, ignore_errors=True)
+
+def remove_job_temp_dir():
+    """Delete the current generation's temp directory and everything in it"""
+    tmp_dir = generation_status.tmp_dir
+    generation_status.tmp_dir = None
+    if tmp_dir:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
 
 def cleanup_resources():
     """Clean up any resources used by the addon"""
-    global generation_status
     
     # Stop any active generations
-    generation_status["active"] = False
+    generation_status.active = False
     
     # Clean up any temporary files
-    try:
-        if generation_status.get("model_path") and os.path.exists(generation_status["model_path"]):
-            try:
-                os.remove(generation_status["model_path"])
-            except:
-                pass
-        
-        if generation_status.get("image_path") and os.path.exists(generation_status["image_path"]):
-            try:
-                os.remove(generation_status["image_path"])
-            except:
-                pass
-    except:
-        pass
+    remove_job_temp_dir()
     
-    # Clear API client to prevent it from holding references
-    generation_status["client"] = None
-        
-    # Reset all request IDs
-    generation_status["image_request_id"] = None
-    generation_status["model_request_id"] = None
-    generation_status["asset_request_id"] = None
-    
-    # Clear URLs
-    generation_status["image_url"] = None
-    generation_status["model_url"] = None
-    
-    # Clear paths
-    generation_status["image_path"] = None
-    generation_status["model_path"] = None
-    
-    # Ensure threads are properly handled
-    for thread in generation_status.get("active_threads", []):
-        # We can't forcibly terminate threads, but we can ensure they're marked as daemon
-        # so they'll exit when Blender does
-        if thread and hasattr(thread, "daemon"):
-            thread.daemon = True
-    
-    # Clear thread list
-    generation_status["active_threads"] = []
-    
-    # Try to remove timers if any are active
-    try:
-        for window in bpy.context.window_manager.windows:
-            for area in window.screen.areas:
-                if area.type == 'VIEW_3D':
-                    for region in area.regions:
-                        if region.type == 'WINDOW':
-                            override = {'window': window, 'screen': window.screen, 'area': area, 'region': region}
-                            try:
-                                # Try to cancel any active poll operation
-                                bpy.ops.mpxgen.poll_status('CANCEL', override)
-                                bpy.ops.mpxgen.download_model('CANCEL', override)
-                            except:
-                                pass
-    except:
-        pass
-        
-    # Explicitly unload any imported external modules to release DLL files
+    # Clear the API client and key, request IDs, URLs and paths
+    generation_status.reset()
+    
+    # Close pooled HTTP connections
+    close_client()
+    close_http_session()
+    
+    # Drop pending background work, running jobs see the inactive flag and are ignored
+    shutdown_executor()
+    
+    # No need to cancel the modal operators here, they see the inactive
+    # flag on their next timer tick and finish by themselves
+    
+    # Explicitly unload any imported external modules to release DLL files.
+    # Done before returning, so a re-enable right after imports them afresh
+    # instead of racing with the removal.
+    _unload_dependency_modules()
+
+def _unload_dependency_modules():
+    """Remove the wheel dependency modules from sys.modules"""
     try:
         modules_to_unload = []
         
         # Find all modules related to our dependencies
-        for module_name in list(sys.modules.keys()):
-            if any(module_name.startswith(prefix) for prefix in [
-                'charset_normalizer', 
-                'pydantic', 
-                'mpx_genai_sdk', 
-                'requests', 
-                'urllib3',
-                'httpx',
-                'idna',
-                'certifi',
-                'anyio',
-                'httpcore',
-                'sniffio',
-                'distro',
-                'h11',
-                'typing_extensions',
-                'annotated_types'
-            ]):
+        for module_name in list(sys.modules):
+            if _DEPENDENCY_MODULE_RE.match(module_name):
                 modules_to_unload.append(module_name)
                 
         # Remove modules from sys.modules
@@ -158,6 +439,59 @@ def cleanup_resources():
     except:
         pass
 
+# View3D areas tagged by force_ui_update, rebuilt whenever the windows'
+# screens change and invalidated when a file is loaded or a new generation starts
+_view3d_areas = None
+_view3d_layout = None
+
+def invalidate_view3d_cache():
+    """Drop the cached View3D areas so they are rebuilt on next use"""
+    global _view3d_areas, _view3d_layout
+    _view3d_areas = None
+    _view3d_layout = None
+
+@persistent
+def _on_load_post(*args):
+    """Area pointers do not survive loading a file"""
+    invalidate_view3d_cache()
+
+def _get_view3d_areas():
+    """Return the View3D areas of all windows, cached until the layout changes"""
+    global _view3d_areas, _view3d_layout
+    windows = bpy.context.window_manager.windows
+    # Switching workspaces, opening or closing windows, splitting or joining
+    # areas and changing an area's editor type all change this key
+    layout = tuple(
+        (window.screen.as_pointer(), tuple(area.type for area in window.screen.areas))
+        for window in windows
+    )
+    if _view3d_areas is None or layout != _view3d_layout:
+        _view3d_areas = [
+            area
+            for window in windows
+            for area in window.screen.areas
+            if area.type == 'VIEW_3D'
+        ]
+        _view3d_layout = layout
+    return _view3d_areas
+
+def _tag_view3d_areas():
+    """Tag all cached View3D areas and their regions for redraw"""
+    for area in _get_view3d_areas():
+        # Only tag the regions for redraw, don't force immediate swap
+        for region in area.regions:
+            region.tag_redraw()
+        area.tag_redraw()
+
+# Minimum time between full redraws requested by force_ui_update (2 Hz)
+_FORCE_REDRAW_INTERVAL = 0.5
+_last_force_redraw = 0.0
+
+def _deferred_force_ui_update():
+    """One-shot timer that redraws after calls skipped by the rate limit"""
+    force_ui_update()
+    return None
+
 def force_ui_update():
     """
     Force Blender to update the UI in all 3D View areas.
@@ -165,16 +499,27 @@ def force_ui_update():
     This ensures that status changes are immediately visible to the user
     even when Blender is busy with other operations. Use sparingly as it
     can cause the mouse cursor to briefly show the busy state.
+    
+    Calls are limited to 2 per second, a call inside the interval
+    schedules a single redraw at its end instead.
     """
-    # Primary method - update all View3D areas
+    global _last_force_redraw
+    now = time.monotonic()
+    wait = _last_force_redraw + _FORCE_REDRAW_INTERVAL - now
+    if wait > 0:
+        if not bpy.app.timers.is_registered(_deferred_force_ui_update):
+            bpy.app.timers.register(_deferred_force_ui_update, first_interval=wait)
+        return
+    _last_force_redraw = now
+    
+    # Primary method - update all cached View3D areas
     try:
-        for window in bpy.context.window_manager.windows:
-            for area in window.screen.areas:
-                if area.type == 'VIEW_3D':
-                    # Only tag the regions for redraw, don't force immediate swap
-                    for region in area.regions:
-                        region.tag_redraw()
-                    area.tag_redraw()
+        try:
+            _tag_view3d_areas()
+        except ReferenceError:
+            # A cached area was freed, rebuild the cache and try once more
+            invalidate_view3d_cache()
+            _tag_view3d_areas()
     except Exception:
         # Fallback method
         try:
@@ -184,6 +529,31 @@ def force_ui_update():
         except Exception:
             pass
 
+# (status_text, progress) updates posted by worker threads, applied by the
+# polling modal on the main thread
+_worker_status = queue.Queue()
+
+def set_worker_status(text, progress):
+    """Post a status update from a worker thread"""
+    _worker_status.put((text, progress))
+
+def discard_worker_status():
+    """Drop status updates posted for an earlier generation"""
+    while True:
+        try:
+            _worker_status.get_nowait()
+        except queue.Empty:
+            return
+
+def show_account_error(error_msg):
+    """Display account-related errors (like missing credits) prominently in the UI"""
+    try:
+        if "Insufficient funds" in error_msg or "credits" in error_msg.lower():
+            if hasattr(bpy.context.scene, "mpx_account_status"):
+                bpy.context.scene.mpx_account_status = "Insufficient credits. Please check your account balance."
+    except:
+        pass
+
 def lightweight_ui_update(context):
     """
     A more efficient UI update that only redraws the necessary panels.
@@ -191,12 +561,13 @@ def lightweight_ui_update(context):
     """
     # Only update sidebar/N-panel UI regions
     try:
-        for window in context.window_manager.windows:
-            for area in window.screen.areas:
-                if area.type == 'VIEW_3D':
-                    for region in area.regions:
-                        if region.type == 'UI':  # Only the sidebar/N-panel
-                            region.tag_redraw()
+        for area in _get_view3d_areas():
+            for region in area.regions:
+                if region.type == 'UI':  # Only the sidebar/N-panel
+                    region.tag_redraw()
+    except ReferenceError:
+        # A cached area was freed, the next update rebuilds the cache
+        invalidate_view3d_cache()
     except Exception:
         pass
 
@@ -217,23 +588,23 @@ class MPXGEN_OT_InstallDependencies(bpy.types.Operator):
 
     def execute(self, context):
         """Try to import required modules and update status"""
+        # The modules were imported already, nothing to check again
+        if Masterpiecex is not None:
+            self.report({'INFO'}, "Masterpiece X SDK is installed and ready to use")
+            return {'FINISHED'}
+        
         try:
             # Refresh the module cache
-            import importlib
             importlib.invalidate_caches()
             
-            # Try to import the required modules
-            from mpx_genai_sdk import Masterpiecex
-            import requests
-            
-            # Update the global flag if successful
-            global MASTERPIECEX_INSTALLED
-            MASTERPIECEX_INSTALLED = True
+            # Try to import the required modules, this updates the global flag
+            ensure_sdk()
             
             self.report({'INFO'}, "Masterpiece X SDK is installed and ready to use")
             
-            # Force UI update to reflect new status
-            force_ui_update()
+            # Only the panel the button was clicked in shows the status
+            if context.area is not None:
+                context.area.tag_redraw()
             
             return {'FINISHED'}
             
@@ -258,27 +629,16 @@ class MPXGEN_OT_CancelGeneration(bpy.types.Operator):
 
     def execute(self, context):
         """Cancel the generation process by updating the global status"""
-        global generation_status
         
-        if not generation_status["active"]:
+        if not generation_status.active:
             self.report({'INFO'}, "No active generation to cancel")
             return {'CANCELLED'}
             
         # Update status to indicate cancellation
-        generation_status["active"] = False
-        generation_status["status_text"] = "Generation cancelled"
-        generation_status["progress"] = 0
-        generation_status["current_step"] = ""
-        
-        # Clean up any running background threads
-        for thread in generation_status["active_threads"]:
-            if thread.is_alive():
-                # Can't forcibly terminate threads in Python, but we can
-                # set a flag for them to check and exit cleanly
-                pass
-                
-        # Clear the threads list
-        generation_status["active_threads"] = []
+        generation_status.active = False
+        generation_status.status_text = "Generation cancelled"
+        generation_status.progress = 0
+        generation_status.current_step = ""
         
         # Don't clear account status messages on cancellation - they should remain visible
         
@@ -290,14 +650,97 @@ class MPXGEN_OT_CancelGeneration(bpy.types.Operator):
         return {'FINISHED'}
 
 
+# Steps waiting on the background requests that start the next API request
+_STARTUP_STEPS = frozenset(("start_image", "process_image", "upload"))
+
+# Statuses after which the API request won't change anymore
+_TERMINAL_STATUSES = frozenset(("complete", "failed"))
+
+# Delay before the second status request, grown by _POLL_BACKOFF after every
+# request up to _POLL_MAX_INTERVAL, all in seconds
+_POLL_INTERVAL = 1.0
+_POLL_BACKOFF = 1.7
+_POLL_MAX_INTERVAL = 8.0
+
+# Relative jitter of the poll delays, so requests don't line up
+_POLL_JITTER = 0.1
+
+# Attempts at a single status request before a connection or server error is reported
+_STATUS_RETRIES = 3
+
+# Give up on a request that hasn't finished after this many seconds
+_POLL_TIMEOUT = 10 * 60
+
+# (request_id, status_response, error) tuples posted by the poller thread
+_status_results = queue.Queue()
+
+def _safe_retrieve(client, request_id):
+    """Fetch the status of request_id, retrying connection and 5xx errors"""
+    delay = _POLL_INTERVAL
+    for attempt in range(_STATUS_RETRIES):
+        try:
+            return client.status.retrieve(request_id)
+        except (APIConnectionError, InternalServerError):
+            if attempt == _STATUS_RETRIES - 1:
+                raise
+            log.warning("Status request for %s failed, retrying", request_id, exc_info=True)
+            time.sleep(delay)
+            delay *= 2
+
+def _prefetch_model(glb_path, cached, status_response):
+    """Start downloading a finished model before the main thread gets to it"""
+    glb = get_output(status_response, 'glb')
+    if glb:
+        return get_executor().submit(_download_model, glb, glb_path, cached)
+    return None
+
+def _poll_status_loop(client, request_id, on_complete=None):
+    """
+    Fetch the status of request_id until it finishes (runs in a poller thread).
+    
+    on_complete is called with the status response, in the poller thread,
+    as soon as the request is complete. What it returns is posted along with
+    the response for the main thread to adopt, the poller itself never
+    writes to generation_status.
+    """
+    deadline = time.monotonic() + _POLL_TIMEOUT
+    delay = _POLL_INTERVAL
+    while True:
+        # Stop when the generation was cancelled or has moved on to another request
+        if not generation_status.active or request_id not in (
+                generation_status.image_request_id, generation_status.model_request_id):
+            return
+        try:
+            status_response = _safe_retrieve(client, request_id)
+        except Exception as e:
+            _status_results.put((request_id, None, e, None))
+            return
+        # Polling is up to a modal tick ahead of the main thread, let the
+        # next step start right away unless the generation moved on meanwhile
+        started = None
+        if (on_complete is not None and status_response.status == "complete"
+                and generation_status.active
+                and request_id in (generation_status.image_request_id, generation_status.model_request_id)):
+            started = on_complete(status_response)
+        _status_results.put((request_id, status_response, None, started))
+        if status_response.status in _TERMINAL_STATUSES:
+            return
+        if time.monotonic() >= deadline:
+            _status_results.put((request_id, None, TimeoutError(
+                f"Request did not finish within {_POLL_TIMEOUT // 60} minutes"), None))
+            return
+        time.sleep(delay * random.uniform(1 - _POLL_JITTER, 1 + _POLL_JITTER))
+        delay = min(delay * _POLL_BACKOFF, _POLL_MAX_INTERVAL)
+
+
 class MPXGEN_OT_PollStatus(bpy.types.Operator):
     """
     Modal operator that polls the API for generation status updates
     
     This operator runs in the background while Blender remains responsive.
-    It periodically checks the status of ongoing generation tasks and
-    updates the UI accordingly. When tasks complete or fail, it initiates
-    the appropriate next steps.
+    The status requests are made by a poller thread, the modal timer only
+    picks up their results, updates the UI accordingly and, when tasks
+    complete or fail, initiates the appropriate next steps.
     """
     bl_idname = "mpxgen.poll_status"
     bl_label = "Poll Generation Status"
@@ -306,151 +749,279 @@ class MPXGEN_OT_PollStatus(bpy.types.Operator):
     
     _timer = None
     _last_expand_time = 0
+    _last_status = None
+    _polled_request_id = None
     
     def modal(self, context, event):
-        """
-        Modal function called on every timer event
-        
-        This checks the generation status, updates the UI, and determines
-        when to move to the next step or terminate.
-        """
-        global generation_status
+        """Check generation status on timer events and advance or terminate"""
         
         # Check if we're still actively generating
-        if not generation_status["active"]:
+        if not generation_status.active:
             self.cancel(context)
             return {'CANCELLED'}
             
         # Handle timer events
         if event.type == 'TIMER':
-            current_time = time.time()
+            # Update status text with elapsed time
+            minutes, seconds = divmod(int(time.monotonic() - generation_status.start_time), 60)
+            time_str = f"{minutes}m {seconds}s"
             
-            # Only poll API every few seconds to avoid rate limits
-            if current_time - generation_status["last_poll_time"] >= 3:
-                # Store previous values to detect changes
-                prev_progress = generation_status["progress"]
-                prev_status = generation_status["status_text"]
-                prev_step = generation_status["current_step"]
-                
-                generation_status["last_poll_time"] = current_time
-                
-                # Update status text with elapsed time
-                elapsed_time = int(current_time - generation_status["start_time"])
-                minutes = elapsed_time // 60
-                seconds = elapsed_time % 60
-                time_str = f"{minutes}m {seconds}s"
-                
-                # Keep the current status text but add the elapsed time
-                if "Generating" in generation_status["status_text"]:
-                    generation_status["status_text"] = f"{generation_status['status_text'].split('(')[0]} ({time_str})"
-                
-                # Process according to current step
-                try:
-                    client = generation_status["client"]
-                    current_step = generation_status["current_step"]
-                    
-                    if current_step == "image" and generation_status["image_request_id"]:
-                        self._check_image_status(client)
-                    elif current_step == "model" and generation_status["model_request_id"]:
-                        self._check_model_status(client)
-                except Exception as e:
-                    self._handle_error(f"Error in polling: {e}")
-                    return {'CANCELLED'}
-                
-                # Only update UI if something changed
-                if (prev_progress != generation_status["progress"] or 
-                    prev_status != generation_status["status_text"] or
-                    prev_step != generation_status["current_step"]):
-                    lightweight_ui_update(context)
+            # Show the elapsed time after the status while waiting on the API
+            if generation_status.current_step in _ELAPSED_TIME_STEPS:
+                generation_status.status_text = f"{generation_status.status_base} ({time_str})"
+            
+            # Process according to current step
+            try:
+                if generation_status.current_step in _STARTUP_STEPS:
+                    self._apply_worker_status()
+                    self._check_startup()
+                self._ensure_poller()
+                self._drain_status_results()
+            except Exception as e:
+                self._handle_error(f"Error in polling: {e}")
+                return {'CANCELLED'}
+            
+            # Only update UI if the displayed state changed since the last redraw
+            state = (
+                generation_status.progress,
+                generation_status.status_text,
+                generation_status.current_step,
+            )
+            if state != self._last_status:
+                self._last_status = state
+                # The panel shows progress through the scene property, which
+                # can be written here but not while drawing
+                context.scene.mpx_progress = generation_status.progress
+                lightweight_ui_update(context)
         
         return {'PASS_THROUGH'}
     
-    def _check_image_status(self, client):
-        """Check status of the text-to-image generation"""
+    def _apply_worker_status(self):
+        """Show the latest status posted by the workers since the last tick"""
+        while True:
+            try:
+                text, progress = _worker_status.get_nowait()
+            except queue.Empty:
+                return
+            generation_status.status_text = text
+            generation_status.progress = progress
+    
+    def _check_startup(self):
+        """Start polling the request a workflow was started with once it has been sent"""
+        startup = generation_status.startup
+        if startup is None or not startup.done():
+            return
+        generation_status.startup = None
+        
+        current_step = generation_status.current_step
         try:
-            status_response = client.status.retrieve(generation_status["image_request_id"])
+            request_id = startup.result()
+        except Exception as e:
+            if current_step == "process_image":
+                self._handle_error(f"Error in processing image: {e}")
+            else:
+                self._handle_error(f"Error initiating generation: {e}")
+            return
+        
+        if current_step == "start_image":
+            # Text-to-image was accepted, wait for the image
+            generation_status.image_request_id = request_id
+            generation_status.current_step = "image"
+            generation_status.status_base = "Generating image from text..."
+            generation_status.progress = 15
+            # The asset the image is uploaded to doesn't need the image, so
+            # create it while the image is being generated
+            generation_status.image_asset = get_executor().submit(
+                _create_image_asset, generation_status.client
+            )
+        elif current_step == "process_image":
+            # Generated image was handed over to image-to-3D, wait for the model
+            generation_status.model_request_id = request_id
+            generation_status.current_step = "model"
+            generation_status.status_base = "Generating 3D model..."
+            generation_status.progress = 60
+        else:
+            # Image was uploaded and image-to-3D accepted, wait for the model
+            generation_status.model_request_id = request_id
+            generation_status.current_step = "model"
+            generation_status.status_base = "Generating 3D model from image..."
+            generation_status.progress = 45
+        generation_status.status_text = generation_status.status_base
+    
+    def _ensure_poller(self):
+        """Start a poller thread for the request the current step waits on"""
+        current_step = generation_status.current_step
+        if current_step == "image":
+            request_id = generation_status.image_request_id
+        elif current_step == "model":
+            request_id = generation_status.model_request_id
+        else:
+            return
+        
+        if request_id and request_id != self._polled_request_id:
+            self._polled_request_id = request_id
+            on_complete = None
+            if current_step == "model":
+                # Pick the destination here, job_temp_path() and the cache
+                # key belong to the main thread
+                glb_path, cached = _model_destination()
+                on_complete = functools.partial(_prefetch_model, glb_path, cached)
+            threading.Thread(
+                target=_poll_status_loop,
+                args=(generation_status.client, request_id, on_complete),
+                daemon=True,
+            ).start()
+    
+    def _drain_status_results(self):
+        """Handle the status responses posted by the poller thread since the last tick"""
+        while True:
+            try:
+                request_id, status_response, error, started = _status_results.get_nowait()
+            except queue.Empty:
+                return
             
-            if status_response.status == "complete":
-                generation_status["progress"] = 35
-                generation_status["status_text"] = "Image generated successfully!"
-                generation_status["current_step"] = "process_image"
-                
-                # Move to processing the image
-                bpy.ops.mpxgen.process_image()
-                
-            elif status_response.status == "failed":
-                self._handle_error("Image generation failed")
+            # Results from a cancelled or earlier request are stale
+            if not generation_status.active or request_id != self._polled_request_id:
+                if started is not None:
+                    started.cancel()
+                continue
+            if started is not None and request_id == generation_status.model_request_id:
+                generation_status.model_download = started
+            if error is not None:
+                raise error
+            
+            if request_id == generation_status.image_request_id:
+                self._check_image_status(status_response)
+            elif request_id == generation_status.model_request_id:
+                self._check_model_status(status_response)
+    
+    def _check_image_status(self, status_response):
+        """Check status of the text-to-image generation"""
+        try:
+            handler = self._IMAGE_STATUS_HANDLERS.get(status_response.status)
+            if handler:
+                handler(self, status_response)
                 
         except Exception as e:
             self._handle_error(f"Error checking image status: {e}")
     
-    def _check_model_status(self, client):
+    def _on_image_complete(self, status_response):
+        """Text-to-image finished, move on to processing the image"""
+        generation_status.progress = 35
+        generation_status.status_text = "Image generated successfully!"
+        generation_status.current_step = "process_image"
+        
+        # Keep the image URL from this response, no need to fetch the status again
+        images = get_output(status_response, 'images')
+        if not images:
+            self._handle_error("No images were generated")
+            return
+        generation_status.image_url = images[0]
+        
+        # Download, upload and start image-to-3D on the worker pool, the
+        # process_image step moves on to the model once they're done
+        generation_status.startup = get_executor().submit(
+            _process_generated_image,
+            generation_status.client,
+            generation_status.image_asset,
+            generation_status.image_url,
+            generation_status.api_key,
+            generation_status.seed,
+            generation_status.texture_size,
+        )
+    
+    def _on_image_failed(self, status_response):
+        """Text-to-image failed"""
+        self._handle_error("Image generation failed")
+    
+    def _check_model_status(self, status_response):
         """Check status of the image-to-3D generation"""
         try:
-            status_response = client.status.retrieve(generation_status["model_request_id"])
-            
             # Update progress based on API response if available
-            if hasattr(status_response, 'progress') and status_response.progress is not None:
+            api_progress = getattr(status_response, 'progress', None)
+            if api_progress is not None:
                 # Scale progress from the API (0-1) to our range based on where we are in the workflow
                 try:
                     # Log original progress value for debugging
-                    print(f"API progress value: {status_response.progress} (type: {type(status_response.progress)})")
+                    log.debug("API progress value: %r", api_progress)
                     
-                    if generation_status["asset_request_id"] and not generation_status["image_request_id"]:
+                    api_progress = min(1.0, float(api_progress))  # Ensure it's between 0 and 1
+                    if not generation_status.image_request_id:
                         # Direct image-to-3D workflow (45-80% of our progress bar)
-                        api_progress = min(1.0, float(status_response.progress))  # Ensure it's between 0 and 1
-                        generation_status["progress"] = min(80, 45 + int(api_progress * 35))
+                        generation_status.progress = min(80, 45 + int(api_progress * 35))
                     else:
                         # Text-to-image-to-3D workflow (60-80% of our progress bar)
-                        api_progress = min(1.0, float(status_response.progress))  # Ensure it's between 0 and 1
-                        generation_status["progress"] = min(80, 60 + int(api_progress * 20))
+                        generation_status.progress = min(80, 60 + int(api_progress * 20))
                     
-                    print(f"Converted to progress: {generation_status['progress']}%")
+                    log.debug("Converted to progress: %s%%", generation_status.progress)
                 except Exception as e:
-                    print(f"Error processing progress value: {e}")
+                    log.warning("Error processing progress value: %s", e)
                     # Fall back to a safe default progress
-                    if generation_status["asset_request_id"] and not generation_status["image_request_id"]:
-                        generation_status["progress"] = 60  # Middle of direct image-to-3D progress range
+                    if not generation_status.image_request_id:
+                        generation_status.progress = 60  # Middle of direct image-to-3D progress range
                     else:
-                        generation_status["progress"] = 70  # Middle of text-to-image-to-3D progress range
+                        generation_status.progress = 70  # Middle of text-to-image-to-3D progress range
             
-            if status_response.status == "complete":
-                generation_status["progress"] = 80
-                generation_status["status_text"] = "3D model generated successfully!"
-                generation_status["current_step"] = "download_model"
-                
-                # Check if there's a model to download
-                if (hasattr(status_response, 'outputs') and 
-                    hasattr(status_response.outputs, 'glb') and 
-                    status_response.outputs.glb):
-                    
-                    generation_status["model_url"] = status_response.outputs.glb
-                    bpy.ops.mpxgen.download_model()
-                else:
-                    self._handle_error("No GLB model was generated")
-                
-            elif status_response.status == "failed":
-                self._handle_error("3D model generation failed")
+            handler = self._MODEL_STATUS_HANDLERS.get(status_response.status)
+            if handler:
+                handler(self, status_response)
                 
         except Exception as e:
             self._handle_error(f"Error checking model status: {e}")
     
+    def _on_model_complete(self, status_response):
+        """Image-to-3D finished, download the model if one was produced"""
+        generation_status.progress = 80
+        generation_status.status_text = "3D model generated successfully!"
+        generation_status.current_step = "download_model"
+        
+        # Check if there's a model to download
+        glb = get_output(status_response, 'glb')
+        if glb:
+            generation_status.model_url = glb
+            # Called directly, going through bpy.ops would run a nested
+            # operator from inside this modal handler
+            try:
+                start_model_download()
+            except Exception as e:
+                self._handle_error(f"Error in downloading model: {e}")
+        else:
+            self._handle_error("No GLB model was generated")
+    
+    def _on_model_failed(self, status_response):
+        """Image-to-3D failed"""
+        self._handle_error("3D model generation failed")
+    
+    # Handlers for terminal API statuses, any other status keeps polling
+    _IMAGE_STATUS_HANDLERS = {
+        "complete": _on_image_complete,
+        "failed": _on_image_failed,
+    }
+    _MODEL_STATUS_HANDLERS = {
+        "complete": _on_model_complete,
+        "failed": _on_model_failed,
+    }
+    
     def _handle_error(self, error_msg):
         """Handle errors during polling"""
-        generation_status["error"] = error_msg
-        generation_status["active"] = False
+        generation_status.error = error_msg
+        generation_status.active = False
+        show_account_error(error_msg)
         self.report({'ERROR'}, error_msg)
         self.cancel(bpy.context)
     
     def execute(self, context):
         """Start the modal timer and register with window manager"""
         wm = context.window_manager
-        # Start timer for periodic checks
-        self._timer = wm.event_timer_add(0.5, window=context.window)
+        # Start timer for periodic checks - it only picks up results posted by
+        # the poller thread, so a 1 s tick is responsive enough
+        self._timer = wm.event_timer_add(1.0, window=context.window)
         wm.modal_handler_add(self)
         
         # Initialize expand time tracking
         self._last_expand_time = 0
+        self._last_status = None
+        self._polled_request_id = None
         
         # Ensure UI is updated immediately but use lightweight update
         lightweight_ui_update(context)
@@ -465,367 +1036,369 @@ class MPXGEN_OT_PollStatus(bpy.types.Operator):
             wm.event_timer_remove(self._timer)
             self._timer = None
         
-        # Update UI one last time
-        force_ui_update()
-                
+        # Whatever ended the generation (import, error or cancel) has
+        # already redrawn the UI
         return {'CANCELLED'}
 
 
-class MPXGEN_OT_ProcessImage(bpy.types.Operator):
-    """
-    Process the generated image and start 3D model generation
-    
-    This operator is called automatically when the text-to-image generation
-    is complete. It downloads the generated image, uploads it to the API,
-    and initiates the 3D model generation process.
-    """
-    bl_idname = "mpxgen.process_image"
-    bl_label = "Process Generated Image"
-    bl_description = "Process the generated image and initiate 3D model generation"
-    bl_options = {'REGISTER', 'INTERNAL'}
-    
-    def execute(self, context):
-        """Process the generated image and start 3D model generation"""
-        global generation_status
+def _create_image_asset(client):
+    """Create the asset the generated image will be uploaded to, returns (asset_url, request_id)"""
+    try:
+        asset_response = client.assets.create(
+            description="Generated image from Blender",
+            name="blender_gen_image.png",
+            type="image/png",
+        )
         
-        try:
-            # Verify we have an image request ID
-            if not generation_status["image_request_id"]:
-                self._handle_error("No image request ID available")
-                return {'CANCELLED'}
-                
-            client = generation_status["client"]
-            
-            # Get the generated image details
-            status_response = client.status.retrieve(generation_status["image_request_id"])
-            
-            # Check if image generation was successful
-            if not (hasattr(status_response, 'outputs') and 
-                    hasattr(status_response.outputs, 'images') and 
-                    status_response.outputs.images):
-                self._handle_error("No images were generated")
-                return {'CANCELLED'}
-                
-            # Get the image URL
-            image_url = status_response.outputs.images[0]
-            generation_status["image_url"] = image_url
-            
-            # Download the image
-            self._download_image(image_url, context)
-            
-            # Create and upload the asset
-            self._upload_image_as_asset(context)
-            
-            # Generate 3D model from image
-            self._start_model_generation(context)
-            
-            # Update UI
-            lightweight_ui_update(context)
-            return {'FINISHED'}
-            
-        except Exception as e:
-            self._handle_error(f"Error in processing image: {e}")
-            return {'CANCELLED'}
-    
-    def _download_image(self, image_url, context):
-        """Download the generated image"""
-        generation_status["status_text"] = "Downloading generated image..."
-        generation_status["progress"] = 40
-        lightweight_ui_update(context)
+        asset_url = getattr(asset_response, 'asset_url', None)
+        request_id = getattr(asset_response, 'request_id', None)
+        if asset_url is None or request_id is None:
+            raise RuntimeError("Invalid asset response from API")
         
-        try:
-            response = requests.get(image_url, timeout=30)
-            response.raise_for_status()
-            
-            # Save image to temporary file
-            tmp_dir = tempfile.gettempdir()
-            image_path = os.path.join(tmp_dir, "mpx_generated_image.png")
-            with open(image_path, "wb") as f:
-                f.write(response.content)
+        return asset_url, request_id
             
-            generation_status["image_path"] = image_path
-            
-        except Exception as e:
-            raise RuntimeError(f"Failed to download image: {e}")
+    except Exception as e:
+        raise RuntimeError(f"Failed to upload image as asset: {e}")
+
+def _transfer_image(image_url, asset_url, api_key):
+    """Copy the generated image to the asset URL (runs in a worker thread)"""
+    set_worker_status("Transferring generated image for 3D conversion...", 45)
+    session = get_http_session()
     
-    def _upload_image_as_asset(self, context):
-        """Create an asset and upload the image"""
-        generation_status["status_text"] = "Uploading image for 3D conversion..."
-        generation_status["progress"] = 50
-        lightweight_ui_update(context)
-        
-        try:
-            client = generation_status["client"]
-            image_path = generation_status["image_path"]
-            
-            # Get API key from preferences
-            preferences = context.preferences.addons.get("bl_ext.user_default.masterpiece_x_generator")
-            if preferences and preferences.preferences:
-                api_key = preferences.preferences.api_key
-            else:
-                raise RuntimeError("API key not found in preferences")
-            
-            # Create asset
-            asset_response = client.assets.create(
-                description="Generated image from Blender",
-                name="blender_gen_image.png",
-                type="image/png",
-            )
+    def transfer():
+        with session.get(image_url, stream=True, timeout=30) as download:
+            download.raise_for_status()
             
-            if not (hasattr(asset_response, 'asset_url') and 
-                    hasattr(asset_response, 'request_id')):
-                raise RuntimeError("Invalid asset response from API")
-                
-            generation_status["asset_request_id"] = asset_response.request_id
-            
-            # Upload the image
             headers = {
                 'Authorization': f'Bearer {api_key}',
                 'Content-Type': 'image/png',
             }
             
-            with open(image_path, 'rb') as image_file:
-                upload_response = requests.put(
-                    asset_response.asset_url, 
-                    data=image_file.read(), 
+            # Nothing but the upload needs the PNG, pass the downloaded bytes
+            # straight through to it when their length is known up front. An
+            # encoded body has to be decoded into memory first.
+            length = download.headers.get('Content-Length')
+            if not length or download.headers.get('Content-Encoding'):
+                return session.put(
+                    asset_url, 
+                    data=download.content, 
                     headers=headers,
                     timeout=60
                 )
             
-            if upload_response.status_code != 200:
-                raise RuntimeError(f"Failed to upload image: {upload_response.text}")
-                
-        except Exception as e:
-            raise RuntimeError(f"Failed to upload image as asset: {e}")
+            # requests can't size the raw stream, so it adds chunked framing
+            # next to our Content-Length but sends the body unchunked. Storage
+            # servers reject a request with both, so only keep the length.
+            headers['Content-Length'] = length
+            request = session.prepare_request(
+                requests.Request('PUT', asset_url, data=download.raw, headers=headers)
+            )
+            request.headers.pop('Transfer-Encoding', None)
+            settings = session.merge_environment_settings(request.url, {}, None, None, None)
+            return session.send(request, timeout=60, **settings)
     
-    def _start_model_generation(self, context):
-        """Initiate 3D model generation from the uploaded image"""
-        generation_status["status_text"] = "Starting 3D model generation..."
-        generation_status["progress"] = 60
-        lightweight_ui_update(context)
+    try:
+        # A retry downloads the image again, the streamed bytes are gone
+        upload_response = retry_upload(transfer)
         
-        try:
-            client = generation_status["client"]
+        if upload_response.status_code != 200:
+            raise RuntimeError(f"Failed to upload image: {response_excerpt(upload_response)}")
             
-            # Initiate 3D model generation
+    except Exception as e:
+        raise RuntimeError(f"Failed to upload image as asset: {e}")
+
+def _process_generated_image(client, image_asset, image_url, api_key, seed, texture_size):
+    """
+    Hand the generated image over to image-to-3D (runs in a worker thread).
+    
+    image_asset is the future of the asset record created while the image
+    was being generated. Returns the request ID of the 3D model generation.
+    """
+    asset_url, asset_request_id = image_asset.result()
+    _transfer_image(image_url, asset_url, api_key)
+    
+    set_worker_status("Starting 3D model generation...", 60)
+    
+    try:
+        # Initiate 3D model generation
+        imageto3d_request = client.functions.imageto3d(
+            image_request_id=asset_request_id,
+            seed=seed,
+            texture_size=texture_size
+        )
+    except Exception as e:
+        error_msg = str(e)
+        if "Insufficient funds" in error_msg:
+            raise RuntimeError(f"Your Masterpiece X account doesn't have enough credits. Please check your account balance.")
+        else:
+            raise RuntimeError(f"Failed to start 3D model generation: {error_msg}")
+    
+    return imageto3d_request.request_id
+
+
+_GLTF_MISSING_MESSAGE = "GLTF importer is not available. Please enable the 'Import-Export: glTF 2.0 format' addon."
+
+def gltf_importer_available():
+    """Whether the glTF importer operator is registered"""
+    # hasattr() on bpy.ops.import_scene is always true, bpy.ops resolves any
+    # name lazily, only registered operators show up in bpy.types
+    return hasattr(bpy.types, "IMPORT_SCENE_OT_gltf")
+
+def _model_destination():
+    """Return (path, cached) the model of the current generation is downloaded to"""
+    if generation_status.cache_key:
+        return model_cache_path(generation_status.cache_key), True
+    return job_temp_path("model.glb"), False
+
+def _download_model(model_url, glb_path, cached):
+    """Download the model to glb_path (runs in a worker thread)"""
+    download_to_file(model_url, glb_path, timeout=60)
+    if cached:
+        evict_model_cache()
+    return glb_path
+
+def _model_download_failed(error_msg):
+    """Stop the generation and show the download/import error"""
+    generation_status.error = error_msg
+    generation_status.active = False
+    log.error(error_msg)
+    force_ui_update()
+
+def _finish_model_download():
+    """
+    Timer callback that imports the model once its download has finished.
+    
+    Runs on the main thread, returns the delay until the next check or
+    None once the download has been handled.
+    """
+    future = generation_status.model_download
+    if future is None:
+        return None
+    if not future.done():
+        return 0.2
+    generation_status.model_download = None
+    
+    # Generation was cancelled while the model was downloading
+    if not generation_status.active or future.cancelled():
+        return None
+    
+    try:
+        glb_path = future.result()
+    except Exception as e:
+        _model_download_failed(f"Error downloading model: {e}")
+        return None
+    
+    _import_model(glb_path)
+    return None
+
+def _import_model(glb_path):
+    """Import the downloaded model, bpy.ops is only safe to call on the main thread"""
+    # No redraw for this status, the import below blocks the main thread
+    # until it's done so it would never be drawn anyway
+    generation_status.model_path = glb_path
+    generation_status.status_text = "Importing 3D model..."
+    generation_status.progress = 90
+    
+    # Check if GLTF importer is still available
+    if not gltf_importer_available():
+        _model_download_failed(_GLTF_MISSING_MESSAGE)
+        return
+    
+    try:
+        bpy.ops.import_scene.gltf(filepath=glb_path)
+    except Exception as e:
+        _model_download_failed(f"Error importing model: {e}")
+        return
+    
+    # Mark generation as complete, which also stops polling
+    generation_status.status_text = "Model imported successfully!"
+    generation_status.progress = 100
+    generation_status.active = False
+    force_ui_update()
+    log.info("Model generated and imported successfully!")
+
+
+def start_model_download():
+    """Download generation_status.model_url and import it once it's done"""
+    if not generation_status.model_url:
+        raise RuntimeError("No model URL available")
+    
+    generation_status.status_text = "Downloading 3D model..."
+    generation_status.progress = 85
+    
+    # Force UI update
+    force_ui_update()
+    
+    # The poller thread usually started the download already
+    if generation_status.model_download is None:
+        generation_status.model_download = get_executor().submit(
+            _download_model, generation_status.model_url, *_model_destination()
+        )
+    if not bpy.app.timers.is_registered(_finish_model_download):
+        bpy.app.timers.register(_finish_model_download, first_interval=0.1)
+
+
+# MIME types of the image formats accepted for image-to-3D
+_MIME_TYPES = {
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.png': 'image/png',
+    '.bmp': 'image/bmp',
+    '.webp': 'image/webp',
+}
+
+# Extension the uploaded asset gets for each MIME type
+_MIME_EXTENSIONS = {
+    'image/jpeg': '.jpg',
+    'image/png': '.png',
+    'image/bmp': '.bmp',
+    'image/webp': '.webp',
+}
+
+def _detect_mime_type(path):
+    """Identify the image format from its first bytes, None if it isn't recognized"""
+    with open(path, 'rb') as f:
+        header = f.read(16)
+    if header.startswith(b'\x89PNG'):
+        return 'image/png'
+    if header.startswith(b'\xff\xd8\xff'):
+        return 'image/jpeg'
+    if header.startswith(b'RIFF') and header[8:12] == b'WEBP':
+        return 'image/webp'
+    if header.startswith(b'BM'):
+        return 'image/bmp'
+    return None
+
+class _AssetNameTable(dict):
+    """str.translate() table that deletes every character it has no entry for"""
+    def __missing__(self, key):
+        return None
+
+# Characters allowed in asset names
+_ASSET_NAME_CHARS = frozenset("abcdefghijklmnopqrstuvwxyz0123456789_.")
+
+# Keeps the allowed characters, turns spaces into underscores
+_ASSET_NAME_TABLE = _AssetNameTable({ord(c): c for c in _ASSET_NAME_CHARS})
+_ASSET_NAME_TABLE[ord(" ")] = "_"
+
+def _get_mime_type_from_extension(filepath):
+    """Determine MIME type from file extension"""
+    extension = os.path.splitext(filepath)[1].lower()
+    return _MIME_TYPES.get(extension, 'image/png')
+
+def _start_text_to_image(client, prompt, num_steps):
+    """Start text-to-image generation (runs in a worker thread), returns its request ID"""
+    try:
+        # Initiate text-to-image generation
+        text_to_image_request = client.components.text2image(
+            prompt=prompt,
+            num_images=1,
+            num_steps=num_steps,
+            lora_id="mpx_game"
+        )
+    except Exception as e:
+        raise RuntimeError(f"Failed to start text-to-image generation: {e}")
+    
+    return text_to_image_request.request_id
+
+def _start_image_to_3d(client, image_path, api_key, seed, texture_size):
+    """
+    Upload the selected image and start image-to-3D on it (runs in a worker thread).
+    
+    Returns the request ID of the 3D model generation.
+    """
+    try:
+        # Get image filename and mime type
+        image_filename = os.path.basename(image_path)
+        # Trust the file contents over a possibly wrong extension, so a
+        # mislabelled file isn't rejected only after the whole upload
+        mime_type = _detect_mime_type(image_path) or _get_mime_type_from_extension(image_path)
+        
+        # Sanitize filename for API - Masterpiece X only allows alphanumeric, underscore and period
+        if _ASSET_NAME_CHARS.issuperset(image_filename):
+            # Already a valid lowercase name, the common case
+            sanitized_filename = image_filename
+        else:
+            # Ensure the filename is lowercase, then replace spaces with underscores
+            # and drop any other character in a single translate() pass
+            sanitized_filename = image_filename.lower().translate(_ASSET_NAME_TABLE)
+        # Ensure filename is not empty and starts with a letter or number
+        stem = os.path.splitext(sanitized_filename)[0]
+        if not stem or not stem[0].isalnum():
+            stem = f"mpx_{int(time.time())}"
+        # Name the asset after the detected format, so a PNG saved as .jpg
+        # isn't uploaded under a name that disagrees with its type
+        sanitized_filename = stem + _MIME_EXTENSIONS[mime_type]
+        
+        # Create asset for image upload
+        set_worker_status("Creating asset for image upload...", 15)
+        
+        asset_response = client.assets.create(
+            description=f"Image uploaded from Blender: {image_filename}",
+            name=sanitized_filename,
+            type=mime_type,
+        )
+        
+        asset_url = getattr(asset_response, 'asset_url', None)
+        request_id = getattr(asset_response, 'request_id', None)
+        if asset_url is None or request_id is None:
+            raise RuntimeError("Invalid asset response from API")
+            
+        # Upload the image
+        set_worker_status("Uploading image...", 25)
+        
+        # Set headers for upload, the file is streamed so requests needs its size up front
+        headers = {
+            'Authorization': f'Bearer {api_key}',
+            'Content-Type': mime_type,
+            'Content-Length': str(os.path.getsize(image_path)),
+        }
+        
+        # Upload the image file, reopened for every try
+        def upload():
+            with open(image_path, 'rb') as image_file:
+                return get_http_session().put(
+                    asset_url, 
+                    data=image_file, 
+                    headers=headers,
+                    timeout=60
+                )
+        
+        try:
+            upload_response = retry_upload(upload)
+        except requests.exceptions.RequestException as e:
+            raise RuntimeError(f"Network error while uploading image: {str(e)}")
+        
+        if upload_response.status_code != 200:
+            excerpt = response_excerpt(upload_response)
+            error_message = f"Failed to upload image: {excerpt}"
+            if "Invalid asset name" in excerpt:
+                error_message += " Please use an image with a simpler filename (letters, numbers, underscores only)."
+            raise RuntimeError(error_message)
+        
+        # Start 3D model generation from the uploaded image
+        set_worker_status("Starting 3D model generation...", 40)
+        
+        # Use the asset request ID to generate the 3D model
+        try:
             imageto3d_request = client.functions.imageto3d(
-                image_request_id=generation_status["asset_request_id"],
-                seed=context.scene.mpx_seed,
-                texture_size=context.scene.mpx_texture_size
+                image_request_id=request_id,
+                seed=seed,
+                texture_size=texture_size
             )
-            
-            # Update status
-            generation_status["model_request_id"] = imageto3d_request.request_id
-            generation_status["current_step"] = "model"
-            generation_status["status_text"] = "Generating 3D model..."
-            
         except Exception as e:
             error_msg = str(e)
-            if "Insufficient funds" in error_msg:
+            if "Invalid asset" in error_msg:
+                raise RuntimeError(f"API rejected the image: {error_msg}. Try a different image or format.")
+            elif "Insufficient funds" in error_msg:
                 raise RuntimeError(f"Your Masterpiece X account doesn't have enough credits. Please check your account balance.")
             else:
                 raise RuntimeError(f"Failed to start 3D model generation: {error_msg}")
-    
-    def _handle_error(self, error_msg):
-        """Handle errors during image processing"""
-        global generation_status
-        generation_status["error"] = error_msg
-        generation_status["active"] = False
-        self.report({'ERROR'}, error_msg)
         
-        # Check for account-related errors
-        try:
-            if "Insufficient funds" in error_msg or "credits" in error_msg.lower():
-                # This is an account status issue - display it prominently in the UI
-                if hasattr(bpy.context.scene, "mpx_account_status"):
-                    bpy.context.scene.mpx_account_status = "Insufficient credits. Please check your account balance."
-        except:
-            pass
-        
-        # Use force_ui_update for errors to ensure visibility
-        try:
-            # For errors, we want immediate feedback, so use force_ui_update
-            force_ui_update()
-        except:
-            # If context is available, fallback to lightweight update
-            if hasattr(bpy, "context"):
-                lightweight_ui_update(bpy.context)
-
-
-class MPXGEN_OT_DownloadModel(bpy.types.Operator):
-    """Download and import the generated 3D model"""
-    bl_idname = "mpxgen.download_model"
-    bl_label = "Download Model"
-    bl_description = "Download and import the generated 3D model"
-    bl_options = {'REGISTER', 'INTERNAL'}
-    
-    _timer = None
-    _thread = None
-    _download_completed = False
-    _model_downloaded = False
-    _download_error = None
-    _glb_path = None
-    
-    def execute(self, context):
-        global generation_status
-        
-        try:
-            if generation_status["model_url"]:
-                generation_status["status_text"] = "Downloading 3D model..."
-                generation_status["progress"] = 85
-                
-                # Force UI update
-                force_ui_update()
-                
-                # Set initial state for download thread
-                self._download_completed = False
-                self._model_downloaded = False
-                self._download_error = None
-                
-                # Start a background thread for downloading
-                self._thread = threading.Thread(
-                    target=self._download_model_thread,
-                    args=(generation_status["model_url"],)
-                )
-                self._thread.daemon = True  # Thread will die when Blender exits
-                self._thread.start()
-                
-                # Add to active threads list for potential cleanup
-                generation_status["active_threads"].append(self._thread)
-                
-                # Start the timer to check for completion
-                wm = context.window_manager
-                self._timer = wm.event_timer_add(0.5, window=context.window)
-                wm.modal_handler_add(self)
-                
-                return {'RUNNING_MODAL'}
-            else:
-                generation_status["error"] = "No model URL available"
-                generation_status["active"] = False
-                self.report({'ERROR'}, generation_status["error"])
-                
-                # Force UI update
-                force_ui_update()
-                            
-                return {'CANCELLED'}
-            
-        except Exception as e:
-            generation_status["error"] = f"Error in downloading model: {str(e)}"
-            generation_status["active"] = False
-            self.report({'ERROR'}, generation_status["error"])
-            
-            # Force UI update
-            force_ui_update()
-                        
-            return {'CANCELLED'}
-    
-    def _download_model_thread(self, model_url):
-        """Background thread function to download the model"""
-        try:
-            # Download the model
-            model_response = requests.get(model_url, timeout=60)
-            model_response.raise_for_status()
-            
-            # Save to temporary file
-            tmp_dir = tempfile.gettempdir()
-            glb_path = os.path.join(tmp_dir, "mpx_generated_model.glb")
-            with open(glb_path, "wb") as model_file:
-                model_file.write(model_response.content)
-            
-            # Set success flags and path for modal callback
-            self._glb_path = glb_path
-            self._model_downloaded = True
-            generation_status["model_path"] = glb_path
-            
-        except Exception as e:
-            self._download_error = str(e)
+        return imageto3d_request.request_id
         
-        finally:
-            # Signal completion to modal operator
-            self._download_completed = True
-            
-    def modal(self, context, event):
-        """Handle modal events and check download status"""
-        if event.type == 'TIMER':
-            # Check if download is finished
-            if self._download_completed:
-                # Remove thread from active threads list
-                if self._thread in generation_status["active_threads"]:
-                    generation_status["active_threads"].remove(self._thread)
-                
-                # Check for error
-                if self._download_error:
-                    generation_status["error"] = f"Error downloading model: {self._download_error}"
-                    generation_status["active"] = False
-                    self.report({'ERROR'}, generation_status["error"])
-                    
-                    # Force UI update
-                    force_ui_update()
-                    
-                    # Remove timer
-                    wm = context.window_manager
-                    wm.event_timer_remove(self._timer)
-                    
-                    return {'CANCELLED'}
-                
-                # Check for success
-                elif self._model_downloaded and self._glb_path:
-                    generation_status["status_text"] = "Importing 3D model..."
-                    generation_status["progress"] = 90
-                    
-                    # Force UI update
-                    force_ui_update()
-                    
-                    # Import the model in the main thread for safety
-                    try:
-                        # Check if GLTF importer is available
-                        if hasattr(bpy.ops.import_scene, 'gltf'):
-                            bpy.ops.import_scene.gltf(filepath=self._glb_path)
-                            
-                            # Mark generation as complete and stop polling
-                            generation_status["status_text"] = "Model imported successfully!"
-                            generation_status["progress"] = 100
-                            # Set active to false immediately to stop polling
-                            generation_status["active"] = False
-                            
-                            # Force UI update
-                            force_ui_update()
-                            
-                            # Remove timer
-                            wm = context.window_manager
-                            wm.event_timer_remove(self._timer)
-                            
-                            self.report({'INFO'}, "Model generated and imported successfully!")
-                            return {'FINISHED'}
-                            
-                        else:
-                            generation_status["error"] = "GLTF importer is not available. Please enable the 'Import-Export: glTF 2.0 format' addon."
-                            generation_status["active"] = False
-                            self.report({'ERROR'}, generation_status["error"])
-                            
-                            # Force UI update
-                            force_ui_update()
-                            
-                            # Remove timer
-                            wm = context.window_manager
-                            wm.event_timer_remove(self._timer)
-                            
-                            return {'CANCELLED'}
-                    except Exception as e:
-                        generation_status["error"] = f"Error importing model: {str(e)}"
-                        generation_status["active"] = False
-                        self.report({'ERROR'}, generation_status["error"])
-                        
-                        # Force UI update
-                        force_ui_update()
-                        
-                        # Remove timer
-                        wm = context.window_manager
-                        wm.event_timer_remove(self._timer)
-                        
-                        return {'CANCELLED'}
-            
-        return {'PASS_THROUGH'}
+    except Exception as e:
+        raise RuntimeError(f"Failed to process image: {e}")
 
 
 class MPXGEN_OT_GenerateModel(bpy.types.Operator):
@@ -850,6 +1423,7 @@ class MPXGEN_OT_GenerateModel(bpy.types.Operator):
         name="Prompt",
         description="Text prompt to generate the 3D model",
         default="",
+        options={'SKIP_SAVE'},
     )
     
     num_steps: IntProperty(
@@ -857,7 +1431,8 @@ class MPXGEN_OT_GenerateModel(bpy.types.Operator):
         description="Number of diffusion steps (higher = better quality but slower)",
         default=4,
         min=1,
-        max=4
+        max=4,
+        options={'SKIP_SAVE'},
     )
     
     texture_size: IntProperty(
@@ -866,14 +1441,16 @@ class MPXGEN_OT_GenerateModel(bpy.types.Operator):
         default=1024,
         min=512,
         max=2048,
-        step=512
+        step=512,
+        options={'SKIP_SAVE'},
     )
     
     seed: IntProperty(
         name="Seed",
         description="Random seed for generation",
         default=1,
-        min=1
+        min=1,
+        options={'SKIP_SAVE'},
     )
     
     from_image: BoolProperty(
@@ -885,23 +1462,41 @@ class MPXGEN_OT_GenerateModel(bpy.types.Operator):
     image_path: StringProperty(
         name="Image Path",
         description="Path to the image file to use for generation",
-        default=""
+        default="",
+        options={'SKIP_SAVE'},
+    )
+    
+    # Operator properties that fall back to the scene setting of the same
+    # name when the caller didn't set them, so the panel only has to pass
+    # from_image. They're SKIP_SAVE so values from the last run don't count
+    # as set.
+    _SCENE_DEFAULTS = (
+        ("prompt", "mpx_prompt"),
+        ("num_steps", "mpx_num_steps"),
+        ("texture_size", "mpx_texture_size"),
+        ("seed", "mpx_seed"),
+        ("image_path", "mpx_image_path"),
     )
 
     def execute(self, context):
         """Set up and start the generation process"""
+        scene = context.scene
+        for prop, scene_prop in self._SCENE_DEFAULTS:
+            if not self.properties.is_property_set(prop):
+                setattr(self, prop, getattr(scene, scene_prop))
+        
         # Verify dependencies are installed
-        if not MASTERPIECEX_INSTALLED:
+        try:
+            ensure_sdk()
+        except ImportError:
             self.report({'ERROR'}, "Masterpiece X SDK is not available. Please restart Blender to load the packages.")
             return {'CANCELLED'}
 
         # Verify API key is set
-        preferences = context.preferences.addons.get("bl_ext.user_default.masterpiece_x_generator")
-        if not preferences or not preferences.preferences or not preferences.preferences.api_key:
+        api_key = get_api_key(context)
+        if not api_key:
             self.report({'ERROR'}, "Please enter your Masterpiece X API key in the addon preferences")
             return {'CANCELLED'}
-        
-        api_key = preferences.preferences.api_key
 
         # Verify input parameters based on generation method
         if self.from_image:
@@ -915,25 +1510,59 @@ class MPXGEN_OT_GenerateModel(bpy.types.Operator):
                 return {'CANCELLED'}
             
         # Check if generation is already in progress
-        global generation_status
-        if generation_status["active"]:
+        if generation_status.active:
             self.report({'WARNING'}, "A generation is already in progress. Please wait or cancel it.")
             return {'CANCELLED'}
         
-        # Initialize generation status
+        # Fail before spending credits on a model that can't be imported
+        if not gltf_importer_available():
+            self.report({'ERROR'}, _GLTF_MISSING_MESSAGE)
+            return {'CANCELLED'}
+        
+        # Remove the previous generation's files, they have been imported already
+        remove_job_temp_dir()
+        
+        # Initialize generation status and pick up any layout changes
         self._reset_generation_status()
-        generation_status["active"] = True
-        generation_status["status_text"] = "Initializing..."
-        generation_status["progress"] = 5
+        invalidate_view3d_cache()
+        generation_status.active = True
+        generation_status.status_text = "Initializing..."
+        generation_status.progress = 5
+        context.scene.mpx_progress = 5
+        # The image-to-3D request of a text prompt is sent later from the
+        # modal, keep the settings the cache key is made of until then
+        generation_status.seed = self.seed
+        generation_status.texture_size = self.texture_size
         
-        # Force immediate UI update
-        force_ui_update()
+        # A text prompt with the same settings was generated before, import
+        # the cached model instead of running the whole pipeline again
+        if not self.from_image:
+            generation_status.cache_key = model_cache_key(
+                prompt=self.prompt,
+                num_steps=self.num_steps,
+                texture_size=generation_status.texture_size,
+                seed=generation_status.seed,
+                lora_id="mpx_game",
+            )
+            cached_path = model_cache_path(generation_status.cache_key)
+            if os.path.isfile(cached_path):
+                # Mark it as recently used for the cache eviction
+                os.utime(cached_path)
+                _import_model(cached_path)
+                if generation_status.error:
+                    self.report({'ERROR'}, generation_status.error)
+                    return {'CANCELLED'}
+                self.report({'INFO'}, "Imported the previously generated model")
+                return {'FINISHED'}
+        
+        # No UI update until the request has been sent, Blender doesn't redraw
+        # before this operator returns anyway
         
         try:
-            # Initialize the Masterpiece X client
-            os.environ["MPX_SDK_BEARER_TOKEN"] = api_key
-            client = Masterpiecex()
-            generation_status["client"] = client
+            # Get the Masterpiece X client, reusing the previous one for the same key
+            client = get_client(api_key)
+            generation_status.client = client
+            generation_status.api_key = api_key
             
             if self.from_image:
                 # Image-to-3D workflow
@@ -951,210 +1580,67 @@ class MPXGEN_OT_GenerateModel(bpy.types.Operator):
     
     def _start_text_based_generation(self, context):
         """Start text-to-image generation workflow"""
-        client = generation_status["client"]
-        
         # Clear any previous account status messages
         if hasattr(context.scene, "mpx_account_status"):
             context.scene.mpx_account_status = ""
         
         # Update status
-        generation_status["status_text"] = "Starting image generation..."
-        generation_status["progress"] = 10
-        generation_status["current_step"] = "image"
+        generation_status.status_text = "Starting image generation..."
+        generation_status.progress = 10
+        generation_status.current_step = "start_image"
         
-        # Force UI update with new status
-        force_ui_update()
+        # Send the request on the worker pool, the polling operator moves on
+        # to the image step once it has been accepted
+        generation_status.startup = get_executor().submit(
+            _start_text_to_image,
+            generation_status.client,
+            self.prompt,
+            self.num_steps,
+        )
         
-        try:
-            # Initiate text-to-image generation
-            text_to_image_request = client.components.text2image(
-                prompt=self.prompt,
-                num_images=1,
-                num_steps=self.num_steps,
-                lora_id="mpx_game"
-            )
-            
-            # Store request ID and update status
-            generation_status["image_request_id"] = text_to_image_request.request_id
-            generation_status["status_text"] = "Generating image from text..."
-            generation_status["progress"] = 15
-            
-            # Update UI and start the polling operator
-            force_ui_update()
-            bpy.ops.mpxgen.poll_status()
-        
-        except Exception as e:
-            raise RuntimeError(f"Failed to start text-to-image generation: {e}")
+        # Update UI and start the polling operator
+        force_ui_update()
+        bpy.ops.mpxgen.poll_status()
     
     def _start_image_based_generation(self, context):
         """Start image-to-3D generation workflow"""
-        client = generation_status["client"]
-        
         # Clear any previous account status messages
         if hasattr(context.scene, "mpx_account_status"):
             context.scene.mpx_account_status = ""
         
         # Update status
-        generation_status["status_text"] = "Preparing to upload image..."
-        generation_status["progress"] = 10
+        generation_status.status_text = "Preparing to upload image..."
+        generation_status.progress = 10
+        generation_status.current_step = "upload"
         
-        # Use lightweight UI update
-        lightweight_ui_update(context)
-        
-        try:
-            # Get image filename and mime type
-            image_filename = os.path.basename(self.image_path)
-            mime_type = self._get_mime_type_from_extension(self.image_path)
-            
-            # Sanitize filename for API - Masterpiece X only allows alphanumeric, underscore and period
-            # First ensure the filename is lowercase
-            sanitized_filename = image_filename.lower()
-            # Replace any spaces with underscores
-            sanitized_filename = sanitized_filename.replace(' ', '_')
-            # Now filter out any non-alphanumeric, non-underscore, non-period characters
-            sanitized_filename = re.sub(r'[^a-z0-9_.]', '', sanitized_filename)
-            # Ensure filename is not empty and starts with a letter or number
-            if not sanitized_filename or not sanitized_filename[0].isalnum():
-                sanitized_filename = f"mpx_{int(time.time())}.{sanitized_filename.split('.')[-1]}"
-            
-            # Create asset for image upload
-            generation_status["status_text"] = "Creating asset for image upload..."
-            generation_status["progress"] = 15
-            lightweight_ui_update(context)
-            
-            asset_response = client.assets.create(
-                description=f"Image uploaded from Blender: {image_filename}",
-                name=sanitized_filename,
-                type=mime_type,
-            )
-            
-            if not (hasattr(asset_response, 'asset_url') and 
-                    hasattr(asset_response, 'request_id')):
-                raise RuntimeError("Invalid asset response from API")
-                
-            generation_status["asset_request_id"] = asset_response.request_id
-            
-            # Upload the image
-            generation_status["status_text"] = "Uploading image..."
-            generation_status["progress"] = 25
-            lightweight_ui_update(context)
-            
-            # Get API key from preferences
-            preferences = context.preferences.addons.get("bl_ext.user_default.masterpiece_x_generator")
-            if preferences and preferences.preferences:
-                api_key = preferences.preferences.api_key
-            else:
-                raise RuntimeError("API key not found in preferences")
-            
-            # Set headers for upload
-            headers = {
-                'Authorization': f'Bearer {api_key}',
-                'Content-Type': mime_type,
-            }
-            
-            # Upload the image file
-            with open(self.image_path, 'rb') as image_file:
-                try:
-                    upload_response = requests.put(
-                        asset_response.asset_url, 
-                        data=image_file.read(), 
-                        headers=headers,
-                        timeout=60
-                    )
-                    
-                    if upload_response.status_code != 200:
-                        error_message = f"Failed to upload image: {upload_response.text}"
-                        if "Invalid asset name" in upload_response.text:
-                            error_message += " Please use an image with a simpler filename (letters, numbers, underscores only)."
-                        raise RuntimeError(error_message)
-                except requests.exceptions.RequestException as e:
-                    raise RuntimeError(f"Network error while uploading image: {str(e)}")
-            
-            # Start 3D model generation from the uploaded image
-            generation_status["status_text"] = "Starting 3D model generation..."
-            generation_status["progress"] = 40
-            lightweight_ui_update(context)
-            
-            # Use the asset request ID to generate the 3D model
-            try:
-                imageto3d_request = client.functions.imageto3d(
-                    image_request_id=generation_status["asset_request_id"],
-                    seed=self.seed,
-                    texture_size=self.texture_size
-                )
-                
-                # Update status to move to model generation step
-                generation_status["model_request_id"] = imageto3d_request.request_id
-                generation_status["current_step"] = "model"
-                generation_status["status_text"] = "Generating 3D model from image..."
-                generation_status["progress"] = 45
-                
-                # Force UI update and start the polling operator
-                lightweight_ui_update(context)
-                bpy.ops.mpxgen.poll_status()
-                
-            except Exception as e:
-                error_msg = str(e)
-                if "Invalid asset" in error_msg:
-                    raise RuntimeError(f"API rejected the image: {error_msg}. Try a different image or format.")
-                elif "Insufficient funds" in error_msg:
-                    raise RuntimeError(f"Your Masterpiece X account doesn't have enough credits. Please check your account balance.")
-                else:
-                    raise RuntimeError(f"Failed to start 3D model generation: {error_msg}")
-            
-        except Exception as e:
-            raise RuntimeError(f"Failed to process image: {e}")
-    
-    def _get_mime_type_from_extension(self, filepath):
-        """Determine MIME type from file extension"""
-        extension = os.path.splitext(filepath)[1].lower()
+        # Upload the image and start 3D model generation on the worker pool,
+        # the polling operator moves on to the model step once they're done
+        generation_status.startup = get_executor().submit(
+            _start_image_to_3d,
+            generation_status.client,
+            self.image_path,
+            generation_status.api_key,
+            self.seed,
+            self.texture_size,
+        )
         
-        mime_types = {
-            '.jpg': 'image/jpeg',
-            '.jpeg': 'image/jpeg',
-            '.png': 'image/png',
-            '.bmp': 'image/bmp',
-            '.webp': 'image/webp',
-        }
-        
-        return mime_types.get(extension, 'image/png')
+        # Update UI and start the polling operator
+        lightweight_ui_update(context)
+        bpy.ops.mpxgen.poll_status()
     
     def _reset_generation_status(self):
-        """Reset the global generation status dictionary"""
-        global generation_status
-        generation_status.update({
-            "active": False,
-            "status_text": "",
-            "progress": 0,
-            "current_step": "",
-            "error": "",
-            "client": None,
-            "image_request_id": None,
-            "image_url": None,
-            "image_path": None,
-            "model_request_id": None,
-            "model_url": None,
-            "model_path": None,
-            "asset_request_id": None,
-            "last_poll_time": time.time(),
-            "start_time": time.time(),
-            "active_threads": []
-        })
+        """Reset the global generation status"""
+        generation_status.reset()
+        generation_status.start_time = time.monotonic()
+        discard_worker_status()
     
     def _handle_error(self, error_msg):
         """Handle errors during generation setup"""
-        global generation_status
-        generation_status["active"] = False
-        generation_status["error"] = error_msg
+        generation_status.active = False
+        generation_status.error = error_msg
         
         # Check for account-related errors
-        try:
-            if "Insufficient funds" in error_msg or "credits" in error_msg.lower():
-                # This is an account status issue - display it prominently in the UI
-                if hasattr(bpy.context.scene, "mpx_account_status"):
-                    bpy.context.scene.mpx_account_status = "Insufficient credits. Please check your account balance."
-        except:
-            pass
+        show_account_error(error_msg)
             
         self.report({'ERROR'}, error_msg)
         force_ui_update()
@@ -1165,62 +1651,48 @@ classes = (
     MPXGEN_OT_InstallDependencies,
     MPXGEN_OT_GenerateModel,
     MPXGEN_OT_PollStatus,
-    MPXGEN_OT_ProcessImage,
-    MPXGEN_OT_DownloadModel,
     MPXGEN_OT_CancelGeneration,
 )
 
+_register_classes, _ = bpy.utils.register_classes_factory(classes)
+
 def register():
-    # Register classes, properly handling existing registrations
-    for cls in classes:
-        try:
-            # First try to unregister if it's already registered
-            if hasattr(bpy.types, cls.__name__):
-                try:
-                    bpy.utils.unregister_class(cls)
-                    print(f"Unregistered existing {cls.__name__} before re-registration")
-                except:
-                    pass
-            
-            # Now register the class
-            bpy.utils.register_class(cls)
-            print(f"Successfully registered {cls.__name__}")
-        except Exception as e:
-            print(f"Could not register {cls.__name__}: {str(e)}")
+    # Register all classes in one pass, Blender replaces any stale copies
+    # left registered under the same idname by a previous load
+    try:
+        _register_classes()
+    except (ValueError, RuntimeError):
+        log.exception("Could not register operator classes")
+    
+    # Drop cached UI areas whenever a new file is loaded
+    if _on_load_post not in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.append(_on_load_post)
+    
+    # Scanning the temp directory can be slow, keep it off Blender's startup
+    threading.Thread(target=remove_stale_temp_dirs, daemon=True).start()
 
 def unregister():
-    # Cancel any active polling operation
-    global generation_status
-    generation_status["active"] = False
-    
-    # Clean up any running threads
-    for thread in generation_status["active_threads"]:
-        if thread.is_alive():
-            # Can't forcibly terminate threads in Python, but we've set them as daemon
-            # so they'll terminate when Blender exits
-            pass
+    # Cancel any active polling operation, the modal operators see the
+    # inactive flag on their next tick and remove their own timers
+    generation_status.active = False
     
-    # Make sure the timer is removed if active
-    try:
-        for window in bpy.context.window_manager.windows:
-            for area in window.screen.areas:
-                if area.type == 'VIEW_3D':
-                    for region in area.regions:
-                        if region.type == 'WINDOW':
-                            override = {'window': window, 'screen': window.screen, 'area': area, 'region': region}
-                            try:
-                                # Try to cancel any active poll operation
-                                bpy.ops.mpxgen.poll_status('CANCEL', override)
-                            except:
-                                pass
-    except:
-        # In case window_manager is not available
-        pass
+    # Stop waiting on a pending model download
+    if bpy.app.timers.is_registered(_finish_model_download):
+        bpy.app.timers.unregister(_finish_model_download)
+    if bpy.app.timers.is_registered(_deferred_force_ui_update):
+        bpy.app.timers.unregister(_deferred_force_ui_update)
     
-    # Unregister classes
+    invalidate_api_key()
+    
+    # Remove the file load handler and cached UI areas
+    if _on_load_post in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(_on_load_post)
+    invalidate_view3d_cache()
+    
+    # Unregister classes one at a time, in reverse, so a class that is
+    # already gone doesn't keep the rest registered
     for cls in reversed(classes):
         try:
-            if hasattr(bpy.types, cls.__name__):
-                bpy.utils.unregister_class(cls)
-        except Exception as e:
-            print(f"Could not unregister {cls.__name__}: {str(e)}") 
\ No newline at end of file
+            bpy.utils.unregister_class(cls)
+        except RuntimeError:
+            log.debug("Operator class %s was not registered", cls.__name__)
@@ -4,10 +4,66 @@ Contains the panel classes and UI layout for the addon
 """
 
 import bpy
+import functools
+import logging
+import os
+import re
+from bpy.app.handlers import persistent
 from bpy.types import Panel
 
 from . import operators
 
+log = logging.getLogger(__name__)
+
+# Image filenames the API accepts without trouble
+_VALID_FILENAME_RE = re.compile(r'^[a-zA-Z0-9_.]+$')
+
+# Basename of the selected image, the path only changes on a new selection
+_image_basename = functools.lru_cache(maxsize=1)(os.path.basename)
+
+# Preview image datablock created by the panel, kept so it can be removed
+# directly instead of searching bpy.data.images by name
+_preview_image = None
+
+def remove_preview_image():
+    """Remove the cached preview image datablock if it still exists"""
+    global _preview_image
+    img, _preview_image = _preview_image, None
+    if img is None:
+        return
+    try:
+        bpy.data.images.remove(img)
+    except ReferenceError:
+        # Datablock was already removed (e.g. a new file was loaded)
+        pass
+
+def _update_preview_image(self, context):
+    """Load the preview for the selected image, panels can't load data while drawing"""
+    global _preview_image
+    remove_preview_image()
+    # Only the image form shows the preview, don't load it for the text form
+    if self.mpx_generation_method != 'IMAGE' or not self.mpx_image_path:
+        return
+    try:
+        # Load the image and give it a specific name for tracking
+        preview_img = bpy.data.images.load(self.mpx_image_path)
+        preview_img.name = "MPX_Preview_Image"
+        _preview_image = preview_img
+    except (RuntimeError, OSError):
+        # If preview fails, the panel just shows the path
+        log.warning("Could not load preview of %s", self.mpx_image_path)
+
+@persistent
+def _reload_preview_image(*args):
+    """Load the preview again for a scene that already has an image selected"""
+    try:
+        scene = bpy.context.scene
+    except AttributeError:
+        # Data isn't available yet while Blender is starting up
+        return
+    if scene is not None and hasattr(scene, "mpx_image_path"):
+        _update_preview_image(scene, bpy.context)
+
 class MPXGEN_PT_MainPanel(Panel):
     """Main panel for the Masterpiece X Generator addon"""
     bl_label = "Masterpiece X Generator"
@@ -16,17 +72,12 @@ class MPXGEN_PT_MainPanel(Panel):
     bl_region_type = "UI"
     bl_category = "Masterpiece X"
     
-    @classmethod
-    def poll(cls, context):
-        """
-        Determine if panel should be drawn and updates panel label
-        Shows active status in panel label when generation is running
-        """
-        if operators.generation_status["active"]:
-            cls.bl_label = f"Masterpiece X Generator ● ACTIVE"
-        else:
-            cls.bl_label = "Masterpiece X Generator"
-        return True
+    def draw_header(self, context):
+        """Show active status in the panel header when generation is running"""
+        if operators.generation_status.active:
+            layout = self.layout
+            layout.alert = True
+            layout.label(text="● ACTIVE")
 
     def draw(self, context):
         """Draw the panel UI elements"""
@@ -36,14 +87,15 @@ class MPXGEN_PT_MainPanel(Panel):
             self._draw_sdk_not_available(layout)
             return
         
-        # Use hardcoded module name to match the bl_idname in preferences
-        preferences = context.preferences.addons.get("bl_ext.user_default.masterpiece_x_generator")
-        if not preferences or not preferences.preferences or not preferences.preferences.api_key:
+        # The key is cached by the operators module and refreshed when the
+        # preference is edited, so redraws don't walk the preferences
+        if not operators.get_api_key(context):
             self._draw_missing_api_key(layout, context)
             return
         
-        if operators.generation_status["active"]:
-            self._draw_active_generation_ui(layout)
+        status = operators.generation_status
+        if status.active:
+            self._draw_active_generation_ui(layout, context, status)
         else:
             # Generation method tabs
             row = layout.row()
@@ -70,38 +122,30 @@ class MPXGEN_PT_MainPanel(Panel):
             text="Open Preferences",
             icon='PREFERENCES'
         )
-        props.module = "bl_ext.user_default.masterpiece_x_generator"
+        props.module = operators.ADDON_ID
     
-    def _draw_active_generation_ui(self, layout):
+    def _draw_active_generation_ui(self, layout, context, status):
         """Draw UI during active generation process"""
         # Status header with alert color
-        box = layout.box()
-        row = box.row()
+        row = layout.row()
         row.alert = True
         row.label(text="▶ GENERATION ACTIVE ◀", icon='INFO')
         
         # Status text
-        status_text = operators.generation_status["status_text"] or "Initializing..."
+        status_text = status.status_text or "Initializing..."
         layout.label(text=status_text)
         
-        # Progress display
-        progress_percent = int(operators.generation_status["progress"])
-        layout.label(text=f"Progress: {progress_percent}%")
-        
-        # Custom progress bar
-        if progress_percent > 0:
-            progress_row = layout.row()
-            for i in range(10):  # 10 segments
-                segment = progress_row.row()
-                if i < progress_percent // 10:
-                    segment.alert = True
-                segment.label(text="█")
+        # Progress display, a read-only slider kept up to date by the polling operator
+        row = layout.row()
+        row.enabled = False
+        row.prop(context.scene, "mpx_progress", text="Progress", slider=True)
         
         # Error display
-        if operators.generation_status["error"]:
+        error = status.error
+        if error:
             box = layout.box()
             box.alert = True
-            box.label(text=f"Error: {operators.generation_status['error']}", icon='ERROR')
+            box.label(text=f"Error: {error}", icon='ERROR')
         
         # Cancel button
         layout.separator()
@@ -131,11 +175,8 @@ class MPXGEN_PT_MainPanel(Panel):
         
         # Generate button
         layout.separator()
+        # The operator reads the settings from the scene itself
         generate_op = layout.operator("mpxgen.generate_model", text="Generate 3D Model", icon='MESH_MONKEY')
-        generate_op.prompt = context.scene.mpx_prompt
-        generate_op.num_steps = context.scene.mpx_num_steps
-        generate_op.texture_size = context.scene.mpx_texture_size
-        generate_op.seed = context.scene.mpx_seed
         generate_op.from_image = False
 
     def _draw_image_generation_form(self, layout, context):
@@ -150,24 +191,18 @@ class MPXGEN_PT_MainPanel(Panel):
         
         if context.scene.mpx_image_path:
             # Show selected image path and preview if possible
-            box.label(text=f"Selected: {bpy.path.basename(context.scene.mpx_image_path)}")
+            box.label(text=f"Selected: {_image_basename(context.scene.mpx_image_path)}")
             
-            # Try to display a preview of the image
-            try:
-                if bpy.data.images.get("MPX_Preview_Image"):
-                    # Remove old preview to refresh
-                    bpy.data.images.remove(bpy.data.images["MPX_Preview_Image"])
-                
-                # Load the image and give it a specific name for tracking
-                preview_img = bpy.data.images.load(context.scene.mpx_image_path)
-                preview_img.name = "MPX_Preview_Image"
-                
-                # Create a preview box with reasonable size
-                preview_box = box.box()
-                preview_box.template_image(preview_img, "MPX_Preview_Image", preview_img.name, compact=False)
-            except Exception:
-                # If preview fails, just show the path without error
-                pass
+            # Display the preview loaded when the image was selected
+            preview_img = _preview_image
+            if preview_img is not None:
+                try:
+                    # Create a preview box with reasonable size
+                    preview_box = box.box()
+                    preview_box.template_image(preview_img, "MPX_Preview_Image", preview_img.name, compact=False)
+                except ReferenceError:
+                    # Datablock was removed (e.g. a new file was loaded), just show the path
+                    pass
             
             row = box.row()
             row.operator("mpxgen.select_image", text="Change Image", icon='FILE_FOLDER')
@@ -177,22 +212,28 @@ class MPXGEN_PT_MainPanel(Panel):
             box.label(text="No image selected")
             box.operator("mpxgen.select_image", text="Select Image", icon='FILE_FOLDER')
         
-        # Image guidelines
+        # Image guidelines, collapsible so they aren't drawn once dismissed
         info_box = layout.box()
-        info_box.label(text="Image Guidelines:", icon='INFO')
-        col = info_box.column()
-        col.scale_y = 0.7
-        col.label(text="• Object should be centered in view")
-        
-        # Split long guidelines into multiple shorter lines
-        col.label(text="• Diffuse lighting w/ minimal shadows")        
-        col.label(text="• Solid blank background")        
-        col.label(text="• Formats: PNG, JPG, JPEG,")
-        col.label(text="  BMP, WEBP")
-        
-        # Add a button to show detailed guidelines
-        row = info_box.row()
-        row.operator("mpxgen.show_guidelines", text="Show Detailed Guidelines", icon='QUESTION')
+        show_guidelines = context.scene.mpx_show_guidelines
+        info_box.prop(
+            context.scene, "mpx_show_guidelines", text="Image Guidelines:",
+            icon='DISCLOSURE_TRI_DOWN' if show_guidelines else 'DISCLOSURE_TRI_RIGHT',
+            emboss=False,
+        )
+        if show_guidelines:
+            col = info_box.column()
+            col.scale_y = 0.7
+            col.label(text="• Object should be centered in view")
+            
+            # Split long guidelines into multiple shorter lines
+            col.label(text="• Diffuse lighting w/ minimal shadows")        
+            col.label(text="• Solid blank background")        
+            col.label(text="• Formats: PNG, JPG, JPEG,")
+            col.label(text="  BMP, WEBP")
+            
+            # Add a button to show detailed guidelines
+            row = info_box.row()
+            row.operator("mpxgen.show_guidelines", text="Show Detailed Guidelines", icon='QUESTION')
         
         # Generation settings
         box = layout.box()
@@ -209,10 +250,7 @@ class MPXGEN_PT_MainPanel(Panel):
         
         if context.scene.mpx_image_path:
             generate_op = row.operator("mpxgen.generate_model", text="Generate 3D Model", icon='MESH_MONKEY')
-            generate_op.texture_size = context.scene.mpx_texture_size
-            generate_op.seed = context.scene.mpx_seed
             generate_op.from_image = True
-            generate_op.image_path = context.scene.mpx_image_path
         else:
             row.enabled = False
             row.operator("mpxgen.generate_model", text="Select an Image First", icon='MESH_MONKEY')
@@ -283,11 +321,8 @@ class MPXGEN_OT_SelectImage(bpy.types.Operator):
     def execute(self, context):
         if self.filepath:
             # Check for potential filename issues
-            import re
-            import os
-            
             filename = os.path.basename(self.filepath)
-            if not re.match(r'^[a-zA-Z0-9_.]+$', filename):
+            if not _VALID_FILENAME_RE.match(filename):
                 self.report({'WARNING'}, f"Image filename '{filename}' contains special characters. This may cause issues with the API.")
                 
             context.scene.mpx_image_path = self.filepath
@@ -306,12 +341,8 @@ class MPXGEN_OT_ClearImage(bpy.types.Operator):
     bl_options = {'REGISTER', 'INTERNAL'}
     
     def execute(self, context):
-        # Clear the image path
+        # Clear the image path, which also removes the preview image
         context.scene.mpx_image_path = ""
-        
-        # Remove the preview image if it exists
-        if bpy.data.images.get("MPX_Preview_Image"):
-            bpy.data.images.remove(bpy.data.images["MPX_Preview_Image"])
             
         return {'FINISHED'}
 
@@ -396,131 +427,120 @@ classes = (
     MPXGEN_OT_ShowGuidelines,
 )
 
+_register_classes, _ = bpy.utils.register_classes_factory(classes)
+
 def register():
     """Register panel classes and properties"""
-    # Register classes, properly handling existing registrations
-    for cls in classes:
-        try:
-            # First try to unregister if it's already registered
-            if hasattr(bpy.types, cls.__name__):
-                try:
-                    bpy.utils.unregister_class(cls)
-                    print(f"Unregistered existing {cls.__name__} before re-registration")
-                except:
-                    pass
-            
-            # Now register the class
-            bpy.utils.register_class(cls)
-            print(f"Successfully registered {cls.__name__}")
-        except Exception as e:
-            print(f"Could not register {cls.__name__}: {e}")
+    # The panel and its helper operators go in together, a copy left over
+    # from an earlier load is replaced under its idname
+    try:
+        _register_classes()
+    except (ValueError, RuntimeError):
+        log.exception("Could not register panel classes")
     
     # Register properties
     _register_properties()
-
-def _register_properties():
-    """Register the scene properties used by the addon"""
-    if not hasattr(bpy.types.Scene, "mpx_prompt"):
-        bpy.types.Scene.mpx_prompt = bpy.props.StringProperty(
-            name="Prompt",
-            description="Text prompt to generate the 3D model",
-            default="A lion running"
-        )
-    
-    if not hasattr(bpy.types.Scene, "mpx_num_steps"):
-        bpy.types.Scene.mpx_num_steps = bpy.props.IntProperty(
-            name="Diffusion Steps",
-            description="Number of diffusion steps (higher = better quality but slower)",
-            default=4,
-            min=1,
-            max=4
-        )
-    
-    if not hasattr(bpy.types.Scene, "mpx_texture_size"):
-        bpy.types.Scene.mpx_texture_size = bpy.props.IntProperty(
-            name="Texture Size",
-            description="Size of texture in pixels",
-            default=1024,
-            min=512,
-            max=2048,
-            step=512
-        )
-    
-    if not hasattr(bpy.types.Scene, "mpx_seed"):
-        bpy.types.Scene.mpx_seed = bpy.props.IntProperty(
-            name="Seed",
-            description="Random seed for generation",
-            default=1,
-            min=1
-        )
     
+    # Loading a file frees the preview and the update callback doesn't run
+    # for a path that is already set, so load it from the handler instead
+    if _reload_preview_image not in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.append(_reload_preview_image)
+    _reload_preview_image()
+
+# Scene properties used by the addon, as (name, property type, keyword arguments)
+_SCENE_PROPERTIES = (
+    ("mpx_prompt", bpy.props.StringProperty, dict(
+        name="Prompt",
+        description="Text prompt to generate the 3D model",
+        default="A lion running",
+    )),
+    ("mpx_num_steps", bpy.props.IntProperty, dict(
+        name="Diffusion Steps",
+        description="Number of diffusion steps (higher = better quality but slower)",
+        default=4,
+        min=1,
+        max=4,
+    )),
+    ("mpx_texture_size", bpy.props.IntProperty, dict(
+        name="Texture Size",
+        description="Size of texture in pixels",
+        default=1024,
+        min=512,
+        max=2048,
+        step=512,
+    )),
+    ("mpx_seed", bpy.props.IntProperty, dict(
+        name="Seed",
+        description="Random seed for generation",
+        default=1,
+        min=1,
+    )),
     # Generation method selection
-    if not hasattr(bpy.types.Scene, "mpx_generation_method"):
-        bpy.types.Scene.mpx_generation_method = bpy.props.EnumProperty(
-            name="Generation Method",
-            description="Method to use for generating 3D models",
-            items=[
-                ('TEXT', "From Text", "Generate 3D model from text description"),
-                ('IMAGE', "From Image", "Generate 3D model from an image")
-            ],
-            default='TEXT'
-        )
-    
+    ("mpx_generation_method", bpy.props.EnumProperty, dict(
+        name="Generation Method",
+        description="Method to use for generating 3D models",
+        items=[
+            ('TEXT', "From Text", "Generate 3D model from text description"),
+            ('IMAGE', "From Image", "Generate 3D model from an image")
+        ],
+        default='TEXT',
+        update=_update_preview_image,
+    )),
     # Image path for image-based generation
-    if not hasattr(bpy.types.Scene, "mpx_image_path"):
-        bpy.types.Scene.mpx_image_path = bpy.props.StringProperty(
-            name="Image Path",
-            description="Path to image file for 3D model generation",
-            default="",
-            subtype='FILE_PATH'
-        )
-    
+    ("mpx_image_path", bpy.props.StringProperty, dict(
+        name="Image Path",
+        description="Path to image file for 3D model generation",
+        default="",
+        subtype='FILE_PATH',
+        update=_update_preview_image,
+    )),
     # Property for UI display of progress
-    if not hasattr(bpy.types.Scene, "mpx_progress"):
-        bpy.types.Scene.mpx_progress = bpy.props.FloatProperty(
-            name="Generation Progress",
-            description="Current progress of the model generation",
-            default=0.0,
-            min=0.0,
-            max=1.0,
-            subtype='PERCENTAGE',
-            options={'SKIP_SAVE'}
-        )
-        
+    ("mpx_progress", bpy.props.FloatProperty, dict(
+        name="Generation Progress",
+        description="Current progress of the model generation",
+        default=0.0,
+        min=0.0,
+        max=100.0,
+        subtype='PERCENTAGE',
+        options={'SKIP_SAVE'},
+    )),
+    # Whether the image form shows the image guidelines
+    ("mpx_show_guidelines", bpy.props.BoolProperty, dict(
+        name="Show Guidelines",
+        description="Show the image guidelines",
+        default=True,
+    )),
     # Property for account status messages
-    if not hasattr(bpy.types.Scene, "mpx_account_status"):
-        bpy.types.Scene.mpx_account_status = bpy.props.StringProperty(
-            name="Account Status",
-            description="Current status of the Masterpiece X account",
-            default="",
-            options={'SKIP_SAVE'}
-        )
+    ("mpx_account_status", bpy.props.StringProperty, dict(
+        name="Account Status",
+        description="Current status of the Masterpiece X account",
+        default="",
+        options={'SKIP_SAVE'},
+    )),
+)
+
+def _register_properties():
+    """Register the scene properties used by the addon"""
+    for name, prop_type, kwargs in _SCENE_PROPERTIES:
+        if not hasattr(bpy.types.Scene, name):
+            setattr(bpy.types.Scene, name, prop_type(**kwargs))
 
 def unregister():
     """Unregister panel classes and properties"""
+    if _reload_preview_image in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(_reload_preview_image)
+    
     _unregister_properties()
     
     # Unregister classes
     for cls in reversed(classes):
         try:
-            if hasattr(bpy.types, cls.__name__):
-                bpy.utils.unregister_class(cls)
-        except Exception as e:
-            print(f"Could not unregister {cls.__name__}: {e}")
+            bpy.utils.unregister_class(cls)
+        except RuntimeError:
+            log.debug("Panel class %s was not registered", cls.__name__)
 
 def _unregister_properties():
     """Unregister the scene properties used by the addon"""
-    properties = [
-        "mpx_prompt", 
-        "mpx_num_steps", 
-        "mpx_texture_size", 
-        "mpx_seed", 
-        "mpx_progress",
-        "mpx_generation_method",
-        "mpx_image_path",
-        "mpx_account_status"
-    ]
-    
-    for prop in properties:
-        if hasattr(bpy.types.Scene, prop):
-            delattr(bpy.types.Scene, prop) 
\ No newline at end of file
+    for name, _prop_type, _kwargs in _SCENE_PROPERTIES:
+        if hasattr(bpy.types.Scene, name):
+            delattr(bpy.types.Scene, name)